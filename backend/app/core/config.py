@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # API Configuration
@@ -22,6 +22,34 @@ class Settings(BaseSettings):
     # Mock Data
     MOCK_DATA_PATH: str = "./mock_data/db.json"
     
+    # Media streaming
+    MEDIA_ROOT: str = "./assets"
+    MEDIA_CACHE_MAX_AGE: int = 86400
+    MEDIA_CHUNK_SIZE: int = 256 * 1024
+    
+    # Search result caching
+    RESULT_CACHE_MAX_ENTRIES: int = 2048
+    RESULT_CACHE_TTL_SECONDS: float = 60.0
+    
+    # Trending places
+    TRENDING_HALF_LIFE_HOURS: float = 24.0
+    TRENDING_TOP_K: int = 100
+    
+    # Global recent check-ins feed
+    RECENT_CHECKINS_BUFFER: int = 500
+    
+    # Home timelines
+    TIMELINE_INBOX_SIZE: int = 500
+    TIMELINE_CELEBRITY_FOLLOWERS: int = 1000
+    TIMELINE_FANOUT_CHUNK: int = 500
+    
+    # Bulk import: these users may import any records, others only their own
+    IMPORT_ADMIN_IDS: List[str] = []
+    
+    # User sub-resource pages (wall, check-ins, bookings)
+    USER_PAGE_SIZE: int = 20
+    USER_PAGE_SIZE_MAX: int = 100
+    
     class Config:
         env_file = ".env"
 
@@ -1,21 +1,37 @@
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.logging.logger import log_api_call, log_error
 
-class APILoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class APILoggingMiddleware:
+    """Pure ASGI logging middleware so streamed and zero-copy responses pass straight through"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
-        method = request.method
-        url_path = str(request.url.path)
-        if request.url.query:
-            url_path += f"?{request.url.query}"
-        
+        method = scope["method"]
+        url_path = scope["path"]
+        query_string = scope.get("query_string", b"")
+        if query_string:
+            url_path += f"?{query_string.decode('latin-1')}"
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
             duration = time.time() - start_time
-            log_api_call(method, url_path, response.status_code, duration)
-            return response
+            log_api_call(method, url_path, status_code, duration)
         except Exception as e:
             duration = time.time() - start_time
             log_error(f"API Error - {method} {url_path}", e)
@@ -1,13 +1,14 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import uvicorn
 
 from app.core.config import settings
 from app.core.logging import APILoggingMiddleware, log_info
-from app.routers import reels, users, places, checkins, bookings, concierge, events, auth, explore, chat
+from app.routers import reels, users, places, checkins, bookings, concierge, events, auth, explore, chat, media, imports
 from app.routes import itineraries, generate_itinerary
+from app.services.reservations import event_reservations
+from app.services.result_cache import result_caches
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -15,7 +16,8 @@ async def lifespan(app: FastAPI):
     print("🚀 Traviax API starting up...")
     log_info("Traviax API starting up...")
     yield
-    # Shutdown
+    # Shutdown: persist event seats still held in memory
+    await event_reservations.flush()
     print("👋 Traviax API shutting down...")
     log_info("Traviax API shutting down...")
 
@@ -38,8 +40,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Static files
-# app.mount("/assets", StaticFiles(directory="assets"), name="assets")
+# Media files (reel videos, thumbnails, place photos) with Range support
+app.include_router(media.router, prefix="/assets", tags=["Media"])
 
 # API routes
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
@@ -52,6 +54,7 @@ app.include_router(concierge.router, prefix="/api/v1/concierge", tags=["AI Conci
 app.include_router(events.router, prefix="/api/v1/events", tags=["Events"])
 app.include_router(explore.router, prefix="/api/v1", tags=["Explore"])
 app.include_router(chat.router, prefix="/api/v1", tags=["Chat"])
+app.include_router(imports.router, prefix="/api/v1/import", tags=["Bulk Import"])
 app.include_router(itineraries.router, tags=["Itineraries"])
 app.include_router(generate_itinerary.router, tags=["AI Itinerary Generation"])
 
@@ -68,6 +71,10 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "traviax-api"}
 
+@app.get("/health/cache")
+async def cache_stats():
+    return {name: cache.stats() for name, cache in result_caches.items()}
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
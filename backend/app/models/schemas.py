@@ -8,6 +8,7 @@ class APIResponse(BaseModel):
     success: bool = True
     data: Optional[Any] = None
     error: Optional[Dict[str, str]] = None
+    meta: Optional[Dict[str, Any]] = None
 
 class ErrorResponse(BaseModel):
     success: bool = False
@@ -83,6 +84,10 @@ class Place(PlaceBase):
     checkins_count: int = 0
     saved_count: int = 0
     category: str
+    calculated_rating: Optional[float] = None
+    rating_count: int = 0
+    rating_distribution: Dict[str, int] = {}
+    saved_by_me: bool = False
 
 # Check-in Schemas
 class CheckinCreate(BaseModel):
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from typing import Optional
 import uuid
 from datetime import datetime
 
 from app.models.schemas import CheckinCreate, Checkin, APIResponse
 from app.services.json_store import json_store
 from app.routers.auth import get_current_user, User
+from app.services.pagination import encode_key_cursor, decode_key_cursor
+from app.services.recent_checkins import recent_checkins, checkin_key
+from app.services.timelines import timelines
 
 router = APIRouter()
 
 @router.post("", response_model=APIResponse)
 async def create_checkin(
     checkin_data: CheckinCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Create a new check-in"""
@@ -31,21 +36,12 @@ async def create_checkin(
         "created_at": datetime.utcnow().isoformat()
     }
     
-    await json_store.add_item("checkins", checkin)
-    
-    # Update place check-in count
-    current_checkins = place.get("checkins_count", 0)
-    await json_store.update_item("places", checkin_data.place_id, {
-        "checkins_count": current_checkins + 1
-    })
-    
-    # Update user stats
-    user_data = await json_store.get_item("users", current_user.id)
-    if user_data:
-        current_user_checkins = user_data.get("checkins", 0)
-        await json_store.update_item("users", current_user.id, {
-            "checkins": current_user_checkins + 1
-        })
+    # Check-in, place count and user stats land together in one save
+    async with json_store.batch() as batch:
+        batch.add("checkins", checkin)
+        batch.increment("places", checkin_data.place_id, "checkins_count")
+        batch.increment("users", current_user.id, "checkins")
+    background_tasks.add_task(timelines.fan_out, "checkins", checkin)
     
     # Add place and user info to response
     checkin["place"] = {
@@ -103,28 +99,19 @@ async def like_checkin(checkin_id: str, current_user: User = Depends(get_current
     return APIResponse(data={"likes": new_likes, "liked": True})
 
 @router.get("", response_model=APIResponse)
-async def get_recent_checkins(limit: int = 20):
+async def get_recent_checkins(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100)
+):
     """Get recent check-ins from all users"""
-    checkins = await json_store.get_collection("checkins")
-    checkins.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    try:
+        before = decode_key_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    
+    await json_store.load_data()
+    checkins, has_more = recent_checkins.page(before, limit)
     
-    # Add user and place info to each check-in
-    for checkin in checkins[:limit]:
-        user = await json_store.get_item("users", checkin["user_id"])
-        place = await json_store.get_item("places", checkin["place_id"])
-        
-        if user:
-            checkin["user"] = {
-                "username": user["username"],
-                "avatar": user["avatar"],
-                "full_name": user["full_name"]
-            }
-        
-        if place:
-            checkin["place"] = {
-                "name": place["name"],
-                "city": place["city"],
-                "cover_photo": place["cover_photo"]
-            }
+    next_cursor = encode_key_cursor(checkin_key(checkins[-1])) if has_more else None
     
-    return APIResponse(data=checkins[:limit])
+    return APIResponse(data=checkins, meta={"count": len(checkins), "next_cursor": next_cursor, "has_more": has_more})
@@ -1,36 +1,53 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
 from typing import Optional, List
 import uuid
 from datetime import datetime
 
 from app.models.schemas import Event, APIResponse
 from app.services.json_store import json_store
+from app.services.response_cache import response_cache
 from app.routers.auth import get_current_user, User
+from app.core.config import settings
+from app.services.event_attendance import event_attendance
+from app.services.event_dates import event_dates
+from app.services.facets import event_facets
+from app.services.pagination import decode_key_cursor, encode_key_cursor
+from app.services.recent_checkins import user_summary
+from app.services.reservations import event_reservations, ALREADY_JOINED, FULL, NOT_FOUND
+from app.services.result_cache import create_cache
+from app.services.user_profiles import activity_key
 
 router = APIRouter()
 
+events_cache = create_cache("events_list")
+
 @router.get("", response_model=APIResponse)
 async def get_events(
     city: Optional[str] = Query(None, description="Filter by city"),
     category: Optional[str] = Query(None, description="Filter by category"),
+    date_from: Optional[str] = Query(None, alias="from", description="Earliest date (ISO date or datetime)"),
+    date_to: Optional[str] = Query(None, alias="to", description="Latest date (ISO date or datetime, inclusive)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
     limit: int = Query(20, ge=1, le=100)
 ):
-    """Get upcoming events"""
-    events = await json_store.get_collection("events")
-    
-    # Filter by city if provided
-    if city:
-        events = [e for e in events if city.lower() in e.get("location", "").lower()]
+    """Get upcoming events, ordered by date"""
+    await json_store.load_data()
+    version = (json_store.collection_version("events"), json_store.collection_version("users"))
+    cache_key = ((city or "").lower(), (category or "").lower(), date_from, date_to, cursor, limit)
+    cached = events_cache.get(cache_key, version)
+    if cached is not None:
+        return cached
     
-    # Filter by category if provided
-    if category:
-        events = [e for e in events if e.get("category", "").lower() == category.lower()]
-    
-    # Sort by date
-    events.sort(key=lambda x: x.get("date", ""))
+    try:
+        page = event_dates.query(date_from, date_to, city, category, decode_key_cursor(cursor), limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    facets = {"all": event_facets.snapshot(), "matching": {"category": page["category_counts"]}}
     
     # Add organizer info
-    for event in events[:limit]:
+    events = []
+    for event in page["events"]:
+        event = dict(event)
         organizer = await json_store.get_item("users", event["organizer_id"])
         if organizer:
             event["organizer"] = {
@@ -38,15 +55,28 @@ async def get_events(
                 "avatar": organizer["avatar"],
                 "full_name": organizer["full_name"]
             }
+        events.append(event)
     
-    return APIResponse(data=events[:limit])
+    meta = {
+        "total": page["total"],
+        "facets": facets,
+        "next_cursor": encode_key_cursor(page["last_key"]) if page["has_more"] else None,
+        "has_more": page["has_more"],
+    }
+    return events_cache.set(cache_key, version, APIResponse(data=events, meta=meta))
 
 @router.get("/{event_id}", response_model=APIResponse)
 async def get_event_details(event_id: str):
     """Get detailed event information"""
+    await json_store.load_data()
+    cached = response_cache.lookup(("events", event_id))
+    if cached is not None:
+        return cached
+    
     event = await json_store.get_item("events", event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
+    event = dict(event)
     
     # Add organizer info
     organizer = await json_store.get_item("users", event["organizer_id"])
@@ -58,36 +88,65 @@ async def get_event_details(event_id: str):
             "bio": organizer["bio"]
         }
     
-    return APIResponse(data=Event(**event))
+    dependencies = [("events", event_id), ("users", event["organizer_id"])]
+    return response_cache.store(("events", event_id), dependencies, APIResponse(data=Event(**event)))
 
 @router.post("/{event_id}/join", response_model=APIResponse)
-async def join_event(event_id: str, current_user: User = Depends(get_current_user)):
+async def join_event(
+    event_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
     """Join an event"""
-    event = await json_store.get_item("events", event_id)
-    if not event:
+    await json_store.load_data()
+    outcome, attendees = event_reservations.reserve(event_id, current_user.id)
+    if outcome == NOT_FOUND:
         raise HTTPException(status_code=404, detail="Event not found")
-    
-    current_attendees = event.get("attendees", 0)
-    max_attendees = event.get("max_attendees", 999)
-    
-    if current_attendees >= max_attendees:
+    if outcome == FULL:
         raise HTTPException(status_code=400, detail="Event is full")
     
-    # Update attendee count
-    new_attendees = current_attendees + 1
-    await json_store.update_item("events", event_id, {"attendees": new_attendees})
+    # The seat is held in memory; concurrent joins are persisted together
+    background_tasks.add_task(event_reservations.flush)
     
+    title = event_reservations.events[event_id]["title"]
     return APIResponse(data={
         "joined": True,
-        "attendees": new_attendees,
-        "message": f"Successfully joined {event['title']}!"
+        "already_joined": outcome == ALREADY_JOINED,
+        "attendees": attendees,
+        "message": f"You're already going to {title}" if outcome == ALREADY_JOINED else f"Successfully joined {title}!"
     })
 
+@router.get("/{event_id}/attendees", response_model=APIResponse)
+async def get_event_attendees(
+    event_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = Query(settings.USER_PAGE_SIZE, ge=1, le=settings.USER_PAGE_SIZE_MAX)
+):
+    """Get the event's attendees, most recently joined first"""
+    try:
+        before = decode_key_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    await json_store.load_data()
+    if event_id not in event_attendance.events:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    records, has_more = event_attendance.event_users(event_id, before, limit)
+    attendees = []
+    for record in records:
+        user = await json_store.get_item("users", record["user_id"])
+        attendees.append({"id": record["user_id"], **(user_summary(user) or {}), "joined_at": record.get("created_at")})
+    
+    meta = {
+        "count": len(attendees),
+        "next_cursor": encode_key_cursor(activity_key(records[-1])) if has_more else None,
+        "has_more": has_more,
+    }
+    return APIResponse(data=attendees, meta=meta)
+
 @router.get("/categories/list", response_model=APIResponse)
 async def get_event_categories():
     """Get list of event categories"""
-    events = await json_store.get_collection("events")
-    categories = list(set(event.get("category", "Other") for event in events))
-    categories.sort()
+    await json_store.load_data()
     
-    return APIResponse(data=categories)
+    return APIResponse(data=event_facets.values("category"))
@@ -1,17 +1,27 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
 import os
 from pathlib import Path
 
+from app.services.catalog import catalog_store, CatalogSnapshot
+from app.services.search_index import build_explore_index, parse_rating
+from app.services.autocomplete import build_autocomplete_index
+from app.services.pagination import SnapshotPager, card, parse_fields
+from app.services.result_cache import create_cache
+from app.services.text import tokenize
+from app.services.similarity import similar_items
+from app.services.trending import trending_places
+from app.services.json_store import json_store
+
 router = APIRouter()
 
-def load_mock_data() -> Dict[str, Any]:
-    """Load mock data from mock.json file"""
+search_cache = create_cache("explore_search")
+
+def load_catalog() -> CatalogSnapshot:
+    """Get the cached mock.json catalog snapshot"""
     try:
-        mock_file_path = Path(__file__).parent.parent.parent / "mock_data" / "mock.json"
-        with open(mock_file_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        return catalog_store.snapshot()
     except FileNotFoundError:
         raise HTTPException(status_code=500, detail="Mock data file not found")
     except json.JSONDecodeError:
@@ -20,6 +30,11 @@ def load_mock_data() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Error loading mock data: {str(e)}")
 
 
+def load_mock_data() -> Dict[str, Any]:
+    """Load mock data from the cached mock.json snapshot"""
+    return load_catalog().data
+
+
 def load_db_data() -> Dict[str, Any]:
     """Load richer home screen data from db.json file"""
     try:
@@ -33,73 +48,67 @@ def load_db_data() -> Dict[str, Any]:
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Error loading home data: {exc}") from exc
 
+
+def list_catalog_page(collection: str, cursor: Optional[str], limit: int, fields: Optional[str]) -> Dict[str, Any]:
+    """One page of a catalog collection, optionally projected to `fields` or the card view"""
+    catalog = load_catalog()
+    pager = catalog.derived(
+        f"pager:{collection}",
+        lambda snapshot: SnapshotPager(snapshot.collection(collection), snapshot.version)
+    )
+    try:
+        page = pager.page(cursor, limit, parse_fields(fields))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"success": True, **page}
+
 @router.get("/hotels")
-async def get_hotels() -> Dict[str, Any]:
-    """Get all hotels from mock data"""
+async def get_hotels(
+    cursor: Optional[str] = Query(None, description="Pagination cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, or 'card'")
+) -> Dict[str, Any]:
+    """Get a page of hotels from mock data"""
     try:
-        mock_data = load_mock_data()
-        hotels = mock_data.get("hotels", [])
-        
-        return {
-            "success": True,
-            "data": hotels,
-            "count": len(hotels)
-        }
+        return list_catalog_page("hotels", cursor, limit, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_search_result(item: Dict[str, Any], item_type: str) -> Dict[str, Any]:
+    image = item.get("image")
+    if not image:
+        photos = item.get("photos", [])
+        image = photos[0] if photos else ""
+
+    return {
+        "id": item.get("id", ""),
+        "type": item_type,
+        "title": item.get("name") or item.get("title") or "",
+        "image": image or "",
+        "rating": parse_rating(item.get("rating")),
+    }
+
 @router.get("/search")
-async def search_explore_items(q: str = Query("", description="Search keyword")) -> Dict[str, Any]:
-    """Search across hotels, places, and activities."""
+async def search_explore_items(
+    q: str = Query("", description="Search keyword"),
+    limit: int = Query(20, ge=1, le=100)
+) -> Dict[str, Any]:
+    """Search across hotels, places, and activities, ranked by relevance and rating."""
     try:
         query = q.strip()
         if not query:
             return {"success": True, "data": [], "error": None}
 
-        mock_data = load_mock_data()
-        query_lower = query.lower()
-
-        def item_matches(item: Dict[str, Any]) -> bool:
-            searchable_fields = ["name", "title", "location", "category"]
-            for field in searchable_fields:
-                value = item.get(field)
-                if value and query_lower in str(value).lower():
-                    return True
-            return False
-
-        def build_result(item: Dict[str, Any], item_type: str) -> Dict[str, Any]:
-            image = item.get("image")
-            if not image:
-                photos = item.get("photos", [])
-                image = photos[0] if photos else ""
-
-            rating = item.get("rating")
-            try:
-                rating_value = float(rating) if rating is not None else 0.0
-            except (TypeError, ValueError):
-                rating_value = 0.0
-
-            return {
-                "id": item.get("id", ""),
-                "type": item_type,
-                "title": item.get("name") or item.get("title") or "",
-                "image": image or "",
-                "rating": rating_value,
-            }
-
-        results: List[Dict[str, Any]] = []
-
-        for hotel in mock_data.get("hotels", []):
-            if item_matches(hotel):
-                results.append(build_result(hotel, "hotel"))
-
-        for place in mock_data.get("places", []):
-            if item_matches(place):
-                results.append(build_result(place, "place"))
-
-        for activity in mock_data.get("activities", []):
-            if item_matches(activity):
-                results.append(build_result(activity, "activity"))
+        catalog = load_catalog()
+        cache_key = (" ".join(tokenize(query)), limit)
+        results = search_cache.get(cache_key, catalog.version)
+        if results is None:
+            index = catalog.derived("explore_search", build_explore_index)
+            results = search_cache.set(cache_key, catalog.version, [
+                build_search_result(item, item_type) for _, item_type, item in index.search(query, limit)
+            ])
 
         return {
             "success": True,
@@ -115,47 +124,73 @@ async def search_explore_items(q: str = Query("", description="Search keyword"))
             "error": str(exc),
         }
 
-@router.get("/places")
-async def get_places() -> Dict[str, Any]:
-    """Get all places from mock data"""
+@router.get("/autocomplete")
+async def autocomplete(
+    q: str = Query("", description="Prefix typed so far"),
+    limit: int = Query(8, ge=1, le=20)
+) -> Dict[str, Any]:
+    """Suggest item names, cities and categories for a prefix, most popular first"""
     try:
-        mock_data = load_mock_data()
-        places = mock_data.get("places", [])
-        
+        catalog = load_catalog()
+        index = catalog.derived("explore_autocomplete", build_autocomplete_index)
+        suggestions = index.suggest(q, limit)
+
         return {
             "success": True,
-            "data": places,
-            "count": len(places)
+            "data": suggestions,
+            "count": len(suggestions)
         }
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+@router.get("/places")
+async def get_places(
+    cursor: Optional[str] = Query(None, description="Pagination cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, or 'card'")
+) -> Dict[str, Any]:
+    """Get a page of places from mock data"""
+    try:
+        return list_catalog_page("places", cursor, limit, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/activities")
-async def get_activities() -> Dict[str, Any]:
-    """Get all activities from mock data"""
+async def get_activities(
+    cursor: Optional[str] = Query(None, description="Pagination cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, or 'card'")
+) -> Dict[str, Any]:
+    """Get a page of activities from mock data"""
     try:
-        mock_data = load_mock_data()
-        activities = mock_data.get("activities", [])
-        
-        return {
-            "success": True,
-            "data": activities,
-            "count": len(activities)
-        }
+        return list_catalog_page("activities", cursor, limit, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/trending-places")
-async def get_trending_places() -> Dict[str, Any]:
-    """Return curated list of trending places for the home screen"""
+async def get_trending_places(limit: int = Query(10, ge=1, le=50)) -> Dict[str, Any]:
+    """Curated trending places, re-ranked by time-decayed check-ins, saves and views"""
     try:
-        db_data = load_db_data()
-        trending_places = db_data.get("trending_places", [])
+        catalog_places = load_catalog().by_id("places")
+
+        # Check-ins are replayed into the tracker, and the curated list mirrored, when the store loads
+        await json_store.load_data()
+        trending = []
+        for place_id, score, place in trending_places.leaders(limit):
+            place = place or catalog_places.get(place_id) or await json_store.get_item("places", place_id)
+            if place:
+                trending.append({**place, "trending_score": round(score, 4)})
 
         return {
             "success": True,
-            "data": trending_places,
-            "count": len(trending_places)
+            "data": trending,
+            "count": len(trending)
         }
     except HTTPException:
         raise
@@ -232,6 +267,20 @@ async def get_hotel_by_id(hotel_id: str) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/hotels/{hotel_id}/similar")
+async def get_similar_hotels(hotel_id: str, limit: int = Query(10, ge=1, le=10)) -> Dict[str, Any]:
+    """Hotels most similar to this one, from precomputed neighbour lists"""
+    neighbours = similar_items.for_snapshot(load_catalog(), "hotels").similar(hotel_id, limit)
+    if neighbours is None:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    
+    data = [{**card(hotel), "score": round(score, 4)} for hotel, score in neighbours]
+    return {
+        "success": True,
+        "data": data,
+        "count": len(data)
+    }
+
 @router.get("/places/{place_id}")
 async def get_place_by_id(place_id: str) -> Dict[str, Any]:
     """Get a specific place by ID"""
@@ -243,6 +292,8 @@ async def get_place_by_id(place_id: str) -> Dict[str, Any]:
         if not place:
             raise HTTPException(status_code=404, detail="Place not found")
         
+        trending_places.record(place_id, "view")
+        
         return {
             "success": True,
             "data": place
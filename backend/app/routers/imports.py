@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+
+from app.core.config import settings
+from app.models.schemas import APIResponse
+from app.routers.auth import get_current_user, User
+from app.services.bulk_import import BulkImporter, IMPORT_BATCH_SIZE, IMPORT_OWNERS, IMPORT_SCHEMAS, ndjson_lines
+
+router = APIRouter()
+
+@router.post("/{collection}", response_model=APIResponse)
+async def bulk_import(
+    collection: str,
+    request: Request,
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=50000),
+    current_user: User = Depends(get_current_user)
+):
+    """Import check-ins, reels or places from an NDJSON request body (one record per line)"""
+    if collection not in IMPORT_SCHEMAS:
+        raise HTTPException(status_code=404, detail=f"Unsupported collection: {collection}")
+    
+    # Admins import anything; everyone else only records that belong to them
+    admin = current_user.id in settings.IMPORT_ADMIN_IDS
+    if not admin and collection not in IMPORT_OWNERS:
+        raise HTTPException(status_code=403, detail=f"Only admins can import {collection}")
+    
+    importer = BulkImporter(collection, batch_size=batch_size, owner_id=None if admin else current_user.id)
+    try:
+        report = await importer.run(ndjson_lines(request.stream()))
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=400, detail="Request body must be UTF-8 NDJSON") from exc
+    
+    return APIResponse(data=report)
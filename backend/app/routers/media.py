@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from app.services.media import (
+    MediaFileResponse,
+    cache_headers,
+    resolve_media_file,
+    parse_range_header,
+    is_not_modified,
+    range_is_current,
+)
+
+router = APIRouter()
+
+@router.api_route("/{file_path:path}", methods=["GET", "HEAD"])
+async def stream_media(file_path: str, request: Request):
+    """Serve reel videos, thumbnails and other assets with HTTP Range support"""
+    media = resolve_media_file(file_path)
+    if not media:
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    send_body = request.method != "HEAD"
+
+    if is_not_modified(media, request.headers):
+        return Response(status_code=304, headers=cache_headers(media))
+
+    byte_range = None
+    if range_is_current(media, request.headers):
+        try:
+            byte_range = parse_range_header(request.headers.get("range"), media.size)
+        except ValueError:
+            return Response(status_code=416, headers={
+                "content-range": f"bytes */{media.size}",
+                "accept-ranges": "bytes",
+            })
+
+    if byte_range is None:
+        return MediaFileResponse(media, send_body=send_body)
+    return MediaFileResponse(media, status_code=206, byte_range=byte_range, send_body=send_body)
@@ -1,22 +1,35 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional, List
+from typing import Any, Dict, Hashable, Optional, List, Tuple
 import uuid
 from datetime import datetime
 import json
-from pathlib import Path
 
 from app.models.schemas import Place, APIResponse, Checkin
 from app.services.json_store import json_store
-from app.routers.auth import get_current_user, User
+from app.routers.auth import get_current_user, get_optional_user, User
+from app.services.catalog import catalog_store
+from app.services.geo_index import store_geo_index, build_catalog_geo_index
+from app.services.facets import place_facets
+from app.services.columnar import PlacesColumns, build_places_columns
+from app.services.result_cache import create_cache
+from app.services.rating_aggregates import place_ratings
+from app.services.text import normalize
+from app.services.recent_checkins import user_summary
+from app.services.similarity import similar_items
+from app.services.pagination import card
+from app.services.trending import trending_places
+from app.services.saved_places import saved_places, saved_place_id, mark_saved
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
-def load_mock_places() -> List[dict]:
+search_cache = create_cache("places_search")
+
+def load_places_columns() -> Tuple[Hashable, PlacesColumns]:
+    """Columns of one catalog snapshot, with that snapshot's version for cache keys"""
     try:
-        mock_file_path = Path(__file__).parent.parent.parent / "mock_data" / "mock.json"
-        with open(mock_file_path, "r", encoding="utf-8") as mock_file:
-            mock_data = json.load(mock_file)
-        return mock_data.get("places", [])
+        snapshot = catalog_store.snapshot()
+        return snapshot.version, snapshot.derived("places_columns", build_places_columns)
     except FileNotFoundError as exc:
         raise HTTPException(status_code=500, detail="Mock data file not found") from exc
     except json.JSONDecodeError as exc:
@@ -24,68 +37,116 @@ def load_mock_places() -> List[dict]:
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Error loading mock places: {exc}") from exc
 
+def load_catalog_places() -> Dict[str, Dict[str, Any]]:
+    try:
+        return catalog_store.snapshot().by_id("places")
+    except (OSError, json.JSONDecodeError) as exc:
+        raise HTTPException(status_code=500, detail=f"Error loading mock places: {exc}") from exc
+
 @router.get("", response_model=APIResponse)
 async def search_places(
     query: Optional[str] = Query(None, description="Search query"),
     city: Optional[str] = Query(None, description="Filter by city"),
     category: Optional[str] = Query(None, description="Filter by category"),
-    limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Optional[User] = Depends(get_optional_user)
 ):
     """Search and filter places"""
-    places = load_mock_places()
-
-    # Apply filters
-    if query:
-        places = [p for p in places if 
-                 query.lower() in p.get("name", "").lower() or 
-                 query.lower() in p.get("summary", "").lower() or
-                 query.lower() in p.get("location", "").lower()]
+    version, columns = load_places_columns()
+    cache_key = (normalize(query or ""), normalize(city or ""), normalize(category or ""), limit)
+    cached = search_cache.get(cache_key, version)
+    if cached is None:
+        # Vectorized filters over pre-normalized columns, then top-k by rating
+        mask = columns.filter(query=query, city=city, category=category)
+        places = columns.top_by_rating(mask, limit)
+        
+        facets = {"all": columns.facets(), "matching": columns.facets(mask)}
+        cached = search_cache.set(cache_key, version, APIResponse(data=places, meta={"total": int(mask.sum()), "facets": facets}))
+    
+    # The cached page is shared; the per-user saved flag is added on the way out
+    await json_store.load_data()
+    user_id = current_user.id if current_user else None
+    return APIResponse(data=mark_saved(cached.data, user_id), meta=cached.meta)
 
-    if city:
-        places = [
-            p for p in places
-            if p.get("city", "").lower() == city.lower()
-            or city.lower() in p.get("location", "").lower()
-        ]
+@router.get("/nearby", response_model=APIResponse)
+async def get_nearby_places(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude"),
+    radius: float = Query(10, gt=0, le=1000, description="Search radius in km"),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Nearest places, hotels and events within a radius, closest first"""
+    await json_store.load_data()
+    store_index = store_geo_index.index
+    hits = store_index.nearest(lat, lng, limit, radius)
+    try:
+        catalog_index = catalog_store.snapshot().derived("geo", build_catalog_geo_index)
+    except (OSError, json.JSONDecodeError) as exc:
+        raise HTTPException(status_code=500, detail=f"Error loading mock places: {exc}") from exc
 
-    if category:
-        places = [p for p in places if p.get("category", "").lower() == category.lower()]
+    # Store items win over catalog items with the same id
+    hits += [hit for hit in catalog_index.nearest(lat, lng, limit, radius) if hit[1] not in store_index.points]
+    hits.sort(key=lambda hit: hit[0])
 
-    # Sort by rating
-    places.sort(key=lambda x: x.get("rating", 0), reverse=True)
-    
-    return APIResponse(data=places[:limit])
+    return APIResponse(data=[
+        {**summary, "distance_km": round(distance, 3)}
+        for distance, _, summary in hits[:limit]
+    ])
 
 @router.get("/{place_id}", response_model=APIResponse)
-async def get_place_details(place_id: str):
+async def get_place_details(place_id: str, current_user: Optional[User] = Depends(get_optional_user)):
     """Get detailed place information"""
     place = await json_store.get_item("places", place_id)
     if not place:
         raise HTTPException(status_code=404, detail="Place not found")
+    trending_places.record(place_id, "view")
+    
+    # saved_by_me differs per viewer, so the viewer is part of the key
+    user_id = current_user.id if current_user else None
+    cache_key = ("places", place_id, user_id)
+    cached = response_cache.lookup(cache_key)
+    if cached is not None:
+        return cached
+    place = dict(place)
     
     # Get recent check-ins for this place
     checkins = await json_store.filter_items("checkins", place_id=place_id)
     checkins.sort(key=lambda x: x.get("created_at", ""), reverse=True)
     
     # Add user info to check-ins
+    recent = []
     for checkin in checkins[:10]:  # Last 10 check-ins
         user = await json_store.get_item("users", checkin["user_id"])
-        if user:
-            checkin["user"] = {
-                "username": user["username"],
-                "avatar": user["avatar"],
-                "full_name": user["full_name"]
-            }
+        recent.append({**checkin, "user": user_summary(user)} if user else checkin)
     
-    place["recent_checkins"] = checkins[:10]
+    place["recent_checkins"] = recent
     
-    # Calculate average rating from check-ins
-    if checkins:
-        ratings = [c.get("rating", 0) for c in checkins if c.get("rating")]
-        if ratings:
-            place["calculated_rating"] = sum(ratings) / len(ratings)
+    # Average rating and distribution from the running per-place aggregates
+    place.update(place_ratings.get(place_id))
+    place["saved_by_me"] = saved_places.is_saved(user_id, place_id)
     
-    return APIResponse(data=Place(**place))
+    # Embedded user summaries go stale when those users change
+    dependencies = [("places", place_id), *{("users", checkin["user_id"]) for checkin in recent}]
+    return response_cache.store(cache_key, dependencies, APIResponse(data=Place(**place)))
+
+@router.get("/{place_id}/similar", response_model=APIResponse)
+async def get_similar_places(
+    place_id: str,
+    limit: int = Query(10, ge=1, le=10),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    """Places most similar to this one, from precomputed neighbour lists"""
+    try:
+        index = similar_items.for_snapshot(catalog_store.snapshot(), "places")
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Error loading mock places: {exc}") from exc
+    neighbours = index.similar(place_id, limit)
+    if neighbours is None:
+        raise HTTPException(status_code=404, detail="Place not found")
+    
+    await json_store.load_data()
+    places = [{**card(place), "score": round(score, 4)} for place, score in neighbours]
+    return APIResponse(data=mark_saved(places, current_user.id if current_user else None))
 
 @router.get("/{place_id}/checkins", response_model=APIResponse)
 async def get_place_checkins(
@@ -116,38 +177,43 @@ async def get_place_checkins(
 async def save_place(place_id: str, current_user: User = Depends(get_current_user)):
     """Save/unsave a place for later"""
     place = await json_store.get_item("places", place_id)
-    if not place:
+    if not place and place_id not in load_catalog_places():
         raise HTTPException(status_code=404, detail="Place not found")
     
-    # In a real app, track saved places per user
-    # For demo, just increment saved count
-    current_saved = place.get("saved_count", 0)
-    new_saved = current_saved + 1
-    
-    await json_store.update_item("places", place_id, {"saved_count": new_saved})
-    
-    return APIResponse(data={"saved": True, "saved_count": new_saved})
+    # Toggle the user's saved record; the saved-places index follows the store
+    record_id = saved_place_id(current_user.id, place_id)
+    if saved_places.is_saved(current_user.id, place_id):
+        await json_store.delete_item("saved_places", record_id)
+        saved, delta = False, -1
+    else:
+        await json_store.add_item("saved_places", {
+            "id": record_id,
+            "user_id": current_user.id,
+            "place_id": place_id,
+            "created_at": datetime.utcnow().isoformat()
+        })
+        trending_places.record(place_id, "save")
+        saved, delta = True, 1
+    
+    if place:
+        saved_count = max(place.get("saved_count", 0) + delta, 0)
+        await json_store.update_item("places", place_id, {"saved_count": saved_count})
+    else:
+        saved_count = saved_places.count(place_id)
+    
+    return APIResponse(data={"saved": saved, "saved_count": saved_count})
 
 @router.get("/categories/list", response_model=APIResponse)
 async def get_place_categories():
     """Get list of available place categories"""
-    places = await json_store.get_collection("places")
-    categories = list(set(place.get("category", "Other") for place in places))
-    categories.sort()
+    await json_store.load_data()
     
-    return APIResponse(data=categories)
+    return APIResponse(data=place_facets.values("category"))
 
 @router.get("/cities/popular", response_model=APIResponse)
 async def get_popular_cities():
     """Get list of popular cities"""
-    places = await json_store.get_collection("places")
-    city_counts = {}
-    
-    for place in places:
-        city = place.get("city", "Unknown")
-        city_counts[city] = city_counts.get(city, 0) + 1
-    
-    # Sort by count and return top cities
-    popular_cities = sorted(city_counts.items(), key=lambda x: x[1], reverse=True)
+    await json_store.load_data()
+    popular_cities = place_facets.top("city", 10)
     
-    return APIResponse(data=[{"city": city, "places_count": count} for city, count in popular_cities[:10]])
+    return APIResponse(data=[{"city": city, "places_count": count} for city, count in popular_cities])
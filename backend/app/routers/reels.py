@@ -5,6 +5,7 @@ from datetime import datetime
 
 from app.models.schemas import Reel, ReelResponse, APIResponse, CommentCreate, Comment
 from app.services.json_store import json_store
+from app.services.response_cache import response_cache
 from app.routers.auth import get_current_user, User
 
 router = APIRouter()
@@ -56,9 +57,15 @@ async def get_reels(
 @router.get("/{reel_id}", response_model=APIResponse)
 async def get_reel_details(reel_id: str):
     """Get detailed reel information"""
+    await json_store.load_data()
+    cached = response_cache.lookup(("reels", reel_id))
+    if cached is not None:
+        return cached
+    
     reel = await json_store.get_item("reels", reel_id)
     if not reel:
         raise HTTPException(status_code=404, detail="Reel not found")
+    reel = dict(reel)
     
     # Add creator info
     creator = await json_store.get_item("users", reel["creator_id"])
@@ -71,18 +78,19 @@ async def get_reel_details(reel_id: str):
         }
     
     # Get comments
-    comments = await json_store.filter_items("comments", reel_id=reel_id)
-    for comment in comments:
+    comments = []
+    for comment in await json_store.filter_items("comments", reel_id=reel_id):
         user = await json_store.get_item("users", comment["user_id"])
         if user:
-            comment["user"] = {
-                "username": user["username"],
-                "avatar": user["avatar"]
-            }
+            comment = {**comment, "user": {"username": user["username"], "avatar": user["avatar"]}}
+        comments.append(comment)
     
     reel["comments_list"] = comments
     
-    return APIResponse(data=Reel(**reel))
+    # The creator and comment authors are embedded, so their edits invalidate the entry
+    authors = {("users", comment["user_id"]) for comment in comments}
+    dependencies = [("reels", reel_id), ("users", reel["creator_id"]), *authors]
+    return response_cache.store(("reels", reel_id), dependencies, APIResponse(data=Reel(**reel)))
 
 @router.post("/{reel_id}/like", response_model=APIResponse)
 async def toggle_like_reel(reel_id: str, current_user: User = Depends(get_current_user)):
@@ -119,11 +127,10 @@ async def add_comment(
         "created_at": datetime.utcnow().isoformat()
     }
     
-    await json_store.add_item("comments", comment)
-    
-    # Update reel comment count
-    current_comments = reel.get("comments", 0)
-    await json_store.update_item("reels", reel_id, {"comments": current_comments + 1})
+    # Comment and reel comment count are saved together
+    async with json_store.batch() as batch:
+        batch.add("comments", comment)
+        batch.increment("reels", reel_id, "comments")
     
     # Add user info to response
     comment["user"] = {
@@ -1,81 +1,113 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from typing import List, Optional
 import uuid
 from datetime import datetime
 
 from app.models.schemas import User, UserProfile, Post, PostCreate, APIResponse
 from app.services.json_store import json_store
 from app.routers.auth import get_current_user
+from app.core.config import settings
+from app.services.catalog import catalog_store
+from app.services.pagination import encode_key_cursor, decode_key_cursor
+from app.services.saved_places import saved_places
+from app.services.recent_checkins import user_summary, place_summary
+from app.services.timelines import follow_graph, follow_id, timelines
+from app.services.user_profiles import user_profiles, activity_key, PROFILE_RECENT_ITEMS
+from app.services.visited_places import visited_places
+from app.services.event_attendance import event_attendance
+from app.services.response_cache import response_cache, CATALOG
 
 router = APIRouter()
 
+def page_limit():
+    return Query(settings.USER_PAGE_SIZE, ge=1, le=settings.USER_PAGE_SIZE_MAX, description="Page size")
+
+def parse_cursor(cursor: Optional[str]):
+    try:
+        return decode_key_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+def page_meta(items: List[dict], has_more: bool, last_key) -> dict:
+    return {
+        "count": len(items),
+        "next_cursor": encode_key_cursor(last_key) if has_more else None,
+        "has_more": has_more
+    }
+
+def visited_place_list(visits) -> List[dict]:
+    """Places with the user's latest rating, last visit and visit count"""
+    places = []
+    for place_id, visit in visits:
+        place = visited_places.place(place_id)
+        if place:
+            places.append({**place, **visit.as_dict()})
+    return places
+
+def attended_event_list(records) -> List[dict]:
+    """Events behind attendance records, with when the user joined"""
+    events = []
+    for record in records:
+        event = event_attendance.events.get(record.get("event_id"))
+        if event:
+            events.append({**event, "joined_at": record.get("created_at")})
+    return events
+
 @router.get("/{user_id}", response_model=APIResponse)
 async def get_user_profile(user_id: str):
-    """Get complete user profile with all related data"""
+    """Get user profile with counts and the most recent items of each kind"""
+    await json_store.load_data()
+    cached = response_cache.lookup(("users", user_id))
+    if cached is not None:
+        return cached
+    
     user = await json_store.get_item("users", user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get user's check-ins
-    checkins = await json_store.filter_items("checkins", user_id=user_id)
-    user["recent_checkins"] = checkins[:5]  # Last 5 check-ins
-    user["total_checkins"] = len(checkins)
-    
-    # Get user's posts/wall posts
-    posts = await json_store.filter_items("posts", user_id=user_id)
-    posts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    
-    # Add user info to each post
-    for post in posts:
-        post["user"] = {
-            "username": user["username"],
-            "avatar": user["avatar"],
-            "full_name": user["full_name"]
-        }
-    
-    user["wall_posts"] = posts
-    user["posts_count"] = len(posts)
-    
-    # Get user's visited places
-    visited_places = await json_store.filter_items("places", visited_by=user_id)
-    user["visited_places_list"] = visited_places
+    # Counts and recent items come from the materialized profile; full lists are paginated sub-resources
+    profile = {**user, **user_profiles.profile(user_id)}
+    author = user_summary(user)
+    profile["wall_posts"] = [{**post, "user": author} for post in profile["wall_posts"]]
     
-    # Get user's bookings
-    bookings = await json_store.filter_items("bookings", user_id=user_id)
-    user["bookings"] = bookings
-    user["bookings_count"] = len(bookings)
+    # Visited places and cities are counted from the user's check-ins
+    profile.update(visited_places.counts(user_id))
+    recent_visits = visited_places.recent(user_id, PROFILE_RECENT_ITEMS)
+    profile["visited_places_list"] = visited_place_list(recent_visits)
     
-    # Get user's events
-    events = await json_store.filter_items("events", attendees=user_id)
-    user["events"] = events
-    user["events_count"] = len(events)
+    # Events the user has joined, most recent first
+    records, _ = event_attendance.user_events(user_id, None, PROFILE_RECENT_ITEMS)
+    profile["events"] = attended_event_list(records)
+    profile["events_count"] = event_attendance.user_count(user_id)
     
-    return APIResponse(data=user)
+    # Embedded events and store places are copies; catalog places are covered by CATALOG
+    dependencies = [("users", user_id), CATALOG]
+    dependencies += [("events", record.get("event_id")) for record in records]
+    dependencies += [("places", place_id) for place_id, _ in recent_visits if place_id in visited_places.places]
+    return response_cache.store(("users", user_id), dependencies, APIResponse(data=profile))
 
 @router.get("/{user_id}/wall", response_model=APIResponse)
-async def get_user_wall(user_id: str):
-    """Get user's wall posts"""
-    posts = await json_store.filter_items("posts", user_id=user_id)
-    
-    # Sort by created_at descending
-    posts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+async def get_user_wall(
+    user_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = page_limit()
+):
+    """Get user's wall posts, newest first"""
+    before = parse_cursor(cursor)
+    user = await json_store.get_item("users", user_id)
+    posts, has_more = user_profiles.page(user_id, "posts", before, limit)
     
     # Add user info to each post
-    user = await json_store.get_item("users", user_id)
-    for post in posts:
-        if user:
-            post["user"] = {
-                "username": user["username"],
-                "avatar": user["avatar"],
-                "full_name": user["full_name"]
-            }
+    author = user_summary(user)
+    data = [{**post, "user": author} if author else post for post in posts]
     
-    return APIResponse(data=posts)
+    return APIResponse(data=data, meta=page_meta(data, has_more, activity_key(posts[-1]) if posts else None))
 
 @router.post("/{user_id}/post", response_model=APIResponse)
 async def create_wall_post(
     user_id: str,
     post_data: PostCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Create a new wall post"""
@@ -93,6 +125,7 @@ async def create_wall_post(
     }
     
     await json_store.add_item("posts", post)
+    background_tasks.add_task(timelines.fan_out, "posts", post)
     
     # Add user info to response
     post["user"] = {
@@ -104,42 +137,140 @@ async def create_wall_post(
     return APIResponse(data=Post(**post))
 
 @router.get("/{user_id}/checkins", response_model=APIResponse)
-async def get_user_checkins(user_id: str):
-    """Get user's check-ins timeline"""
-    checkins = await json_store.filter_items("checkins", user_id=user_id)
-    
-    # Sort by created_at descending
-    checkins.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+async def get_user_checkins(
+    user_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = page_limit()
+):
+    """Get user's check-ins timeline, newest first"""
+    before = parse_cursor(cursor)
+    await json_store.load_data()
+    checkins, has_more = user_profiles.page(user_id, "checkins", before, limit)
     
     # Add place info to each check-in
+    data = []
     for checkin in checkins:
-        place = await json_store.get_item("places", checkin["place_id"])
-        if place:
-            checkin["place"] = {
-                "name": place["name"],
-                "city": place["city"],
-                "cover_photo": place["cover_photo"]
-            }
+        place = place_summary(visited_places.place(checkin.get("place_id")))
+        data.append({**checkin, "place": place} if place else checkin)
     
-    return APIResponse(data=checkins)
+    return APIResponse(data=data, meta=page_meta(data, has_more, activity_key(checkins[-1]) if checkins else None))
 
 @router.get("/{user_id}/places", response_model=APIResponse)
 async def get_user_visited_places(user_id: str):
-    """Get places visited by user"""
-    checkins = await json_store.filter_items("checkins", user_id=user_id)
+    """Get places visited by user, most recent visit first"""
+    await json_store.load_data()
+    visits = sorted(
+        visited_places.visits(user_id).items(),
+        key=lambda pair: (pair[1].last_visit, pair[1].last_checkin_id),
+        reverse=True
+    )
+    return APIResponse(data=visited_place_list(visits))
+
+@router.get("/{user_id}/saved", response_model=APIResponse)
+async def get_user_saved_places(
+    user_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = page_limit()
+):
+    """Get places saved by user, most recently saved first"""
+    user = await json_store.get_item("users", user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     
-    # Get unique places
-    place_ids = list(set(checkin["place_id"] for checkin in checkins))
-    places = []
+    before = parse_cursor(cursor)
+    
+    entries, has_more = saved_places.page(user_id, before, limit)
+    catalog_places = catalog_store.snapshot().by_id("places")
     
-    for place_id in place_ids:
-        place = await json_store.get_item("places", place_id)
+    places = []
+    for saved_at, place_id in entries:
+        place = catalog_places.get(place_id) or await json_store.get_item("places", place_id)
         if place:
-            # Add user's rating for this place
-            user_checkins = [c for c in checkins if c["place_id"] == place_id]
-            if user_checkins:
-                place["user_rating"] = user_checkins[-1]["rating"]
-                place["last_visit"] = user_checkins[-1]["created_at"]
-            places.append(place)
-    
-    return APIResponse(data=places)
+            places.append({**place, "saved_at": saved_at})
+    
+    return APIResponse(data=places, meta=page_meta(places, has_more and bool(entries), entries[-1] if entries else None))
+
+@router.post("/{user_id}/follow", response_model=APIResponse)
+async def follow_user(
+    user_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """Follow/unfollow a user"""
+    if current_user.id == user_id:
+        raise HTTPException(status_code=400, detail="Cannot follow yourself")
+    user = await json_store.get_item("users", user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Edge and both counters are saved together
+    following = not follow_graph.is_following(current_user.id, user_id)
+    async with json_store.batch() as batch:
+        if following:
+            batch.add("follows", {
+                "id": follow_id(current_user.id, user_id),
+                "follower_id": current_user.id,
+                "followee_id": user_id,
+                "created_at": datetime.utcnow().isoformat()
+            })
+        else:
+            batch.delete("follows", follow_id(current_user.id, user_id))
+        delta = 1 if following else -1
+        batch.increment("users", user_id, "followers", delta)
+        batch.increment("users", current_user.id, "following", delta)
+    
+    if following:
+        background_tasks.add_task(timelines.backfill, current_user.id, user_id)
+    
+    return APIResponse(data={"following": following, "followers": user.get("followers", 0)})
+
+@router.get("/{user_id}/timeline", response_model=APIResponse)
+async def get_user_timeline(
+    user_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = page_limit()
+):
+    """Get user's home timeline: check-ins and posts from people they follow, newest first"""
+    user = await json_store.get_item("users", user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    before = parse_cursor(cursor)
+    
+    entries, has_more = timelines.page(user_id, before, limit)
+    
+    authors = {}
+    items = []
+    for _, kind, author_id, item in entries:
+        if author_id not in authors:
+            authors[author_id] = user_summary(await json_store.get_item("users", author_id))
+        items.append({"type": kind, "item": item, "user": authors[author_id]})
+    
+    return APIResponse(data=items, meta=page_meta(items, has_more, entries[-1][0] if entries else None))
+
+@router.get("/{user_id}/events", response_model=APIResponse)
+async def get_user_events(
+    user_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = page_limit()
+):
+    """Get events the user has joined, most recently joined first"""
+    before = parse_cursor(cursor)
+    await json_store.load_data()
+    records, has_more = event_attendance.user_events(user_id, before, limit)
+    events = attended_event_list(records)
+    
+    return APIResponse(data=events, meta=page_meta(events, has_more, activity_key(records[-1]) if records else None))
+
+@router.get("/{user_id}/bookings", response_model=APIResponse)
+async def get_user_bookings(
+    user_id: str,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
+    limit: int = page_limit()
+):
+    """Get user's bookings, newest first"""
+    before = parse_cursor(cursor)
+    await json_store.load_data()
+    bookings, has_more = user_profiles.page(user_id, "bookings", before, limit)
+    
+    return APIResponse(data=bookings, meta=page_meta(bookings, has_more, activity_key(bookings[-1]) if bookings else None))
@@ -0,0 +1,150 @@
+import heapq
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from app.services.text import tokenize
+
+# Prefixes matching more keys than this get their top-k precomputed at build
+# time; anything narrower is answered by scanning its slice of the key array.
+SCAN_THRESHOLD = 256
+MAX_SUGGESTIONS = 20
+
+CATALOG_KINDS = (("hotels", "hotel"), ("places", "place"), ("activities", "activity"))
+
+
+def item_popularity(item: Dict[str, Any]) -> float:
+    popularity = 0.0
+    for field in ("reviews", "checkins_count", "saved_count"):
+        try:
+            popularity += float(item.get(field) or 0)
+        except (TypeError, ValueError):
+            continue
+    return popularity
+
+
+def prefix_end(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with `prefix` (None: no bound)"""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+def prefix_run_end(keys: List[str], prefix: str, lo: int = 0, hi: Optional[int] = None) -> int:
+    """End of the run of keys starting with `prefix`, searching keys[lo:hi]"""
+    hi = len(keys) if hi is None else hi
+    end = prefix_end(prefix)
+    return hi if end is None else bisect_left(keys, end, lo, hi)
+
+
+def item_city(item: Dict[str, Any]) -> Optional[str]:
+    if item.get("city"):
+        return str(item["city"])
+    location = item.get("location")
+    if location:
+        return str(location).split(",")[0].strip() or None
+    return None
+
+
+class AutocompleteIndex:
+    """Sorted-array prefix index over item names, cities and categories.
+
+    Every suggestion is keyed at each of its word starts, so "pal" suggests
+    "Grand Palace Hotel Dubai". Lookups are a bisect plus either a
+    precomputed top-k (broad prefixes) or a bounded scan (narrow ones).
+    """
+
+    def __init__(self, suggestions: List[Dict[str, Any]]):
+        self.suggestions = suggestions
+        # Higher popularity first, shorter text breaks ties
+        self.rank = [(s["popularity"], -len(s["text"])) for s in suggestions]
+        self.keys: List[str] = []
+        self.ids: List[int] = []
+        self.top: Dict[str, List[int]] = {}
+        self._build()
+
+    def _build(self) -> None:
+        entries = []
+        for suggestion_id, suggestion in enumerate(self.suggestions):
+            tokens = tokenize(suggestion["text"])
+            for start in range(len(tokens)):
+                entries.append((" ".join(tokens[start:]), suggestion_id))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.ids = [suggestion_id for _, suggestion_id in entries]
+        if self.keys:
+            self._precompute("", 0, len(self.keys))
+
+    def _best(self, candidates, limit: int = MAX_SUGGESTIONS) -> List[int]:
+        return heapq.nlargest(limit, set(candidates), key=self.rank.__getitem__)
+
+    def _precompute(self, prefix: str, lo: int, hi: int) -> List[int]:
+        """Top suggestions for a prefix range, recursing into broad child prefixes"""
+        if hi - lo <= SCAN_THRESHOLD:
+            return self._best(self.ids[lo:hi])
+
+        depth = len(prefix)
+        candidates = []
+        position = lo
+        # Keys equal to the prefix itself sort first
+        while position < hi and len(self.keys[position]) == depth:
+            candidates.append(self.ids[position])
+            position += 1
+        while position < hi:
+            child = prefix + self.keys[position][depth]
+            end = prefix_run_end(self.keys, child, position, hi)
+            candidates.extend(self._precompute(child, position, end))
+            position = end
+
+        best = self._best(candidates)
+        self.top[prefix] = best
+        return best
+
+    def suggest(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        prefix = " ".join(tokenize(query))
+        if not prefix:
+            return []
+
+        best = self.top.get(prefix)
+        if best is None:
+            lo = bisect_left(self.keys, prefix)
+            hi = prefix_run_end(self.keys, prefix, lo)
+            best = self._best(self.ids[lo:hi], limit)
+
+        return [
+            {key: value for key, value in self.suggestions[suggestion_id].items() if key != "popularity"}
+            for suggestion_id in best[:limit]
+        ]
+
+
+def build_autocomplete_index(snapshot) -> AutocompleteIndex:
+    """Collect name, city and category suggestions from a catalog snapshot"""
+    suggestions: List[Dict[str, Any]] = []
+    cities: Dict[str, float] = {}
+    categories: Dict[str, float] = {}
+
+    for collection, item_type in CATALOG_KINDS:
+        for item in snapshot.collection(collection):
+            name = item.get("name") or item.get("title")
+            popularity = item_popularity(item)
+            if name:
+                suggestions.append({
+                    "text": str(name),
+                    "type": item_type,
+                    "id": item.get("id"),
+                    "popularity": popularity,
+                })
+            city = item_city(item)
+            if city:
+                cities[city] = cities.get(city, 0.0) + 1.0 + popularity
+            if item.get("category"):
+                category = str(item["category"])
+                categories[category] = categories.get(category, 0.0) + 1.0 + popularity
+
+    for kind, totals in (("city", cities), ("category", categories)):
+        for text, popularity in totals.items():
+            suggestions.append({"text": text, "type": kind, "id": None, "popularity": popularity})
+
+    return AutocompleteIndex(suggestions)
@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+
+from app.models.schemas import Checkin, Place, Reel
+from app.services.catalog import catalog_store
+from app.services.json_store import BulkWrite, JSONStore, json_store
+
+IMPORT_SCHEMAS: Dict[str, type] = {"checkins": Checkin, "reels": Reel, "places": Place}
+# Response-only fields that are never persisted (ratings are aggregated from check-ins)
+IMPORT_EXCLUDE: Dict[str, Set[str]] = {
+    "places": {"saved_by_me", "calculated_rating", "rating_count", "rating_distribution"},
+}
+# Field naming the user a record belongs to; collections without one are admin-only
+IMPORT_OWNERS: Dict[str, str] = {"checkins": "user_id", "reels": "creator_id"}
+# Entities a record points at, which must exist: collection -> (referenced collection, id field)
+IMPORT_REFERENCES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "checkins": (("users", "user_id"), ("places", "place_id")),
+    "reels": (("users", "creator_id"),),
+}
+# Counters an imported record bumps, as create_checkin does: collection -> (target collection, id field, counter)
+IMPORT_COUNTERS: Dict[str, Tuple[Tuple[str, str, str], ...]] = {
+    "checkins": (("places", "place_id", "checkins_count"), ("users", "user_id", "checkins")),
+}
+IMPORT_BATCH_SIZE = 1000
+# Keep the report small however bad the input is
+MAX_REPORTED_ERRORS = 50
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into text lines without buffering the whole body"""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if pending:
+        yield pending.decode("utf-8")
+
+
+async def iterate_lines(lines: Iterable[str]) -> AsyncIterator[str]:
+    for line in lines:
+        yield line
+
+
+class BulkImporter:
+    """Validates NDJSON records against the API schemas in batches and loads them in one bulk write.
+
+    Records are parsed and validated batch by batch, with per-batch
+    throughput recorded, and stored as the validated model dumps, so
+    unknown keys are dropped and types coerced. Each valid batch is
+    appended to the store as it is validated, so only one batch is held
+    at a time; indexes are rebuilt and the file saved once at the end.
+    Records whose id already exists, in the store or earlier in the
+    stream, are skipped. Records must point at existing users and places,
+    and with an `owner_id` they must belong to that user.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        store: JSONStore = json_store,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        owner_id: Optional[str] = None,
+    ):
+        if collection_name not in IMPORT_SCHEMAS:
+            raise ValueError(f"Unsupported collection: {collection_name}")
+        self.collection_name = collection_name
+        self.schema = IMPORT_SCHEMAS[collection_name]
+        self.store = store
+        self.batch_size = batch_size
+        self.owner_id = owner_id
+        self.imported = 0
+        self.batches: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.error_count = 0
+        self.skipped = 0
+
+    def _error(self, line_number: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_number, "error": message})
+
+    async def _known_ids(self) -> Dict[str, Set[str]]:
+        known = {}
+        for collection_name, _ in IMPORT_REFERENCES.get(self.collection_name, ()):
+            ids = {item.get("id") for item in await self.store.get_collection(collection_name)}
+            if collection_name == "places":
+                ids.update(catalog_store.snapshot().by_id("places"))
+            known[collection_name] = ids
+        return known
+
+    def _check(self, record: Dict[str, Any], known: Dict[str, Set[str]]) -> Optional[str]:
+        owner_field = IMPORT_OWNERS.get(self.collection_name)
+        if self.owner_id is not None and record.get(owner_field) != self.owner_id:
+            return f"{owner_field}: must be the importing user"
+        for collection_name, field in IMPORT_REFERENCES.get(self.collection_name, ()):
+            if record.get(field) not in known[collection_name]:
+                return f"{field}: not found"
+        return None
+
+    def _validate_batch(self, batch: List[Any], seen: Set[str], known: Dict[str, Set[str]]) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        records = []
+        for line_number, line in batch:
+            try:
+                record = self.schema(**json.loads(line)).model_dump(
+                    mode="json", exclude=IMPORT_EXCLUDE.get(self.collection_name)
+                )
+            except json.JSONDecodeError as exc:
+                self._error(line_number, f"Invalid JSON: {exc.msg}")
+                continue
+            except ValidationError as exc:
+                first = exc.errors()[0]
+                self._error(line_number, f"{'.'.join(str(part) for part in first['loc'])}: {first['msg']}")
+                continue
+            except TypeError:
+                self._error(line_number, "Record must be a JSON object")
+                continue
+            problem = self._check(record, known)
+            if problem:
+                self._error(line_number, problem)
+                continue
+            if record["id"] in seen:
+                self.skipped += 1
+                continue
+            seen.add(record["id"])
+            records.append(record)
+
+        seconds = time.perf_counter() - started
+        self.batches.append({
+            "batch": len(self.batches) + 1,
+            "records": len(batch),
+            "valid": len(records),
+            "seconds": round(seconds, 4),
+            "records_per_second": round(len(batch) / seconds, 1) if seconds > 0 else None,
+        })
+        return records
+
+    def _load(self, bulk: BulkWrite, records: List[Dict[str, Any]]) -> None:
+        bulk.extend(self.collection_name, records)
+        for record in records:
+            for collection_name, field, counter in IMPORT_COUNTERS.get(self.collection_name, ()):
+                bulk.increment(collection_name, record[field], counter)
+        self.imported += len(records)
+
+    async def run(self, lines: AsyncIterator[str]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        async with self.store.bulk() as bulk:
+            existing = await self.store.get_collection(self.collection_name)
+            seen = {item.get("id") for item in existing}
+            known = await self._known_ids()
+
+            batch: List[Any] = []
+            line_number = 0
+            async for line in lines:
+                line_number += 1
+                if not line.strip():
+                    continue
+                batch.append((line_number, line))
+                if len(batch) >= self.batch_size:
+                    self._load(bulk, self._validate_batch(batch, seen, known))
+                    batch = []
+                    # Let other requests run between batches
+                    await asyncio.sleep(0)
+            if batch:
+                self._load(bulk, self._validate_batch(batch, seen, known))
+            commit_started = time.perf_counter()
+        commit_seconds = time.perf_counter() - commit_started
+
+        total_seconds = time.perf_counter() - started
+        processed = sum(b["records"] for b in self.batches)
+        return {
+            "collection": self.collection_name,
+            "processed": processed,
+            "imported": self.imported,
+            "skipped": self.skipped,
+            "failed": self.error_count,
+            "errors": self.errors,
+            "batches": self.batches,
+            "commit_seconds": round(commit_seconds, 4),
+            "total_seconds": round(total_seconds, 4),
+            "records_per_second": round(processed / total_seconds, 1) if total_seconds > 0 else None,
+        }
+
+
+async def _main(args: argparse.Namespace) -> int:
+    importer = BulkImporter(args.collection, batch_size=args.batch_size)
+    with open(args.path, "r", encoding="utf-8") if args.path != "-" else sys.stdin as source:
+        report = await importer.run(iterate_lines(source))
+    for batch in report["batches"]:
+        print(f"batch {batch['batch']}: {batch['valid']}/{batch['records']} valid in {batch['seconds']}s ({batch['records_per_second']} rec/s)", file=sys.stderr)
+    print(json.dumps({key: value for key, value in report.items() if key != "batches"}, indent=2))
+    return 0 if not report["failed"] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import NDJSON records into the JSON store")
+    parser.add_argument("collection", choices=sorted(IMPORT_SCHEMAS))
+    parser.add_argument("path", help="NDJSON file, or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    sys.exit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,63 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CATALOG_PATH = Path(__file__).parent.parent.parent / "mock_data" / "mock.json"
+
+
+class CatalogSnapshot:
+    """An immutable view of the explore catalog plus structures derived from it"""
+
+    def __init__(self, data: Dict[str, Any], version: int):
+        self.data = data
+        self.version = version
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> List[Dict[str, Any]]:
+        return self.data.get(name, [])
+
+    def by_id(self, name: str) -> Dict[str, Dict[str, Any]]:
+        """Id lookup for a collection, built once per snapshot"""
+        return self.derived(f"by_id:{name}", lambda snap: {item.get("id"): item for item in snap.collection(name)})
+
+    def derived(self, key: str, builder: Callable[["CatalogSnapshot"], Any]) -> Any:
+        """Build an index for this snapshot once and reuse it until the catalog changes"""
+        value = self._derived.get(key)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = builder(self)
+                    self._derived[key] = value
+        return value
+
+
+class CatalogStore:
+    """Keeps mock.json parsed in memory and reloads it only when the file changes"""
+
+    def __init__(self, path: Path = CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._fingerprint: Optional[Tuple[int, int]] = None
+        self._version = 0
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Return the current snapshot, re-reading the file if its mtime or size changed"""
+        stat_result = self.path.stat()
+        fingerprint = (stat_result.st_mtime_ns, stat_result.st_size)
+        if self._snapshot is None or fingerprint != self._fingerprint:
+            with self._lock:
+                if self._snapshot is None or fingerprint != self._fingerprint:
+                    with open(self.path, "r", encoding="utf-8") as file:
+                        data = json.load(file)
+                    self._version += 1
+                    self._snapshot = CatalogSnapshot(data, self._version)
+                    self._fingerprint = fingerprint
+        return self._snapshot
+
+
+# Global instance
+catalog_store = CatalogStore()
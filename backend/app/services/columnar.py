@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.facets import PLACE_FACETS
+from app.services.search_index import parse_rating
+from app.services.text import normalize
+
+TEXT_COLUMNS = ("name", "summary", "location")
+
+
+class _Codes:
+    """Dictionary-encodes a categorical column on its normalized value"""
+
+    def __init__(self, values: List[str]):
+        self.lookup: Dict[str, int] = {}
+        self.labels: List[str] = []
+        codes = np.empty(len(values), dtype=np.int32)
+        for row, value in enumerate(values):
+            key = normalize(value)
+            code = self.lookup.get(key)
+            if code is None:
+                code = len(self.labels)
+                self.lookup[key] = code
+                self.labels.append(value)
+            codes[row] = code
+        self.codes = codes
+
+    def code(self, value: str) -> int:
+        return self.lookup.get(normalize(value), -1)
+
+    def counts(self, mask: Optional[np.ndarray] = None) -> Dict[str, int]:
+        codes = self.codes if mask is None else self.codes[mask]
+        totals = np.bincount(codes, minlength=len(self.labels))
+        order = np.argsort(-totals, kind="stable")
+        return {self.labels[code]: int(totals[code]) for code in order if totals[code] > 0}
+
+
+class PlacesColumns:
+    """Column-oriented copy of the catalog places for vectorized filter and top-k.
+
+    Ratings are a float array, category and city are dictionary-encoded
+    int32 arrays, and the searchable text fields are pre-normalized UTF-8
+    byte arrays (a byte substring match is a character substring match in
+    UTF-8, at a quarter of the memory of fixed-width unicode). A request is
+    a few mask operations and a partition rather than per-place Python work.
+    """
+
+    def __init__(self, places: List[Dict[str, Any]]):
+        self.places = places
+        self.rating = np.array([parse_rating(p.get("rating")) for p in places], dtype=np.float64)
+        category_field, category_default = PLACE_FACETS["category"]
+        city_field, city_default = PLACE_FACETS["city"]
+        self.category = _Codes([str(p.get(category_field) or category_default) for p in places])
+        self.city = _Codes([str(p.get(city_field) or city_default) for p in places])
+        self.text = {
+            field: np.array([normalize(str(p.get(field) or "")).encode("utf-8") for p in places], dtype=bytes)
+            for field in TEXT_COLUMNS
+        }
+        self._all_facets: Optional[Dict[str, Dict[str, int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _contains(self, field: str, needle: str) -> np.ndarray:
+        column = self.text[field]
+        if column.size == 0:
+            return np.zeros(0, dtype=bool)
+        return np.char.find(column, needle.encode("utf-8")) >= 0
+
+    def filter(self, query: Optional[str] = None, city: Optional[str] = None, category: Optional[str] = None) -> np.ndarray:
+        """Boolean mask of places matching the search filters"""
+        mask = np.ones(len(self), dtype=bool)
+
+        if query:
+            needle = normalize(query)
+            mask &= self._contains("name", needle) | self._contains("summary", needle) | self._contains("location", needle)
+
+        if city:
+            mask &= (self.city.codes == self.city.code(city)) | self._contains("location", normalize(city))
+
+        if category:
+            mask &= self.category.codes == self.category.code(category)
+
+        return mask
+
+    def top_by_rating(self, mask: np.ndarray, limit: int) -> List[Dict[str, Any]]:
+        """Highest-rated matches, ties in catalog order, without sorting every match"""
+        rows = np.flatnonzero(mask)
+        if rows.size > limit:
+            # Partition finds the limit-th best rating in O(n); keep everything at least that good
+            cutoff = np.partition(self.rating[rows], rows.size - limit)[rows.size - limit]
+            rows = rows[self.rating[rows] >= cutoff]
+        order = np.lexsort((rows, -self.rating[rows]))
+        return [self.places[row] for row in rows[order][:limit]]
+
+    def facets(self, mask: Optional[np.ndarray] = None) -> Dict[str, Dict[str, int]]:
+        if mask is None:
+            if self._all_facets is None:
+                self._all_facets = {"category": self.category.counts(), "city": self.city.counts()}
+            return self._all_facets
+        return {"category": self.category.counts(mask), "city": self.city.counts(mask)}
+
+
+def build_places_columns(snapshot) -> PlacesColumns:
+    return PlacesColumns(snapshot.collection("places"))
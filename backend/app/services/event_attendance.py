@@ -0,0 +1,68 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.json_store import StoreObserver, json_store
+from app.services.user_profiles import ActivityKey, OrderedItems
+
+
+class EventAttendance(StoreObserver):
+    """Who goes to what: user -> events and event -> users, from `event_attendees` records.
+
+    Both sides keep their records ordered by (created_at, id), so a page of
+    a user's events or of an event's attendees is a bisect plus a slice and
+    counts are list lengths. Events are mirrored by id so a page of records
+    resolves to events without a scan. Seats still pending in the
+    reservation engine appear once they are flushed.
+    """
+    collections = ("event_attendees", "events")
+
+    def __init__(self):
+        self.by_user: Dict[str, OrderedItems] = {}
+        self.by_event: Dict[str, OrderedItems] = {}
+        self.events: Dict[str, Dict[str, Any]] = {}
+
+    def _add(self, record: Dict[str, Any]) -> None:
+        self.by_user.setdefault(record.get("user_id"), OrderedItems()).add(record)
+        self.by_event.setdefault(record.get("event_id"), OrderedItems()).add(record)
+
+    def _remove(self, record: Dict[str, Any]) -> None:
+        for index in (self.by_user.get(record.get("user_id")), self.by_event.get(record.get("event_id"))):
+            if index is not None:
+                index.remove(record)
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.by_user = {}
+        self.by_event = {}
+        self.events = {event.get("id"): event for event in data.get("events", [])}
+        for record in data.get("event_attendees", []):
+            self._add(record)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if collection_name == "events":
+            if before is not None:
+                self.events.pop(before.get("id"), None)
+            if after is not None:
+                self.events[after.get("id")] = after
+            return
+        if before is not None:
+            self._remove(before)
+        if after is not None:
+            self._add(after)
+
+    def user_events(self, user_id: str, before: Optional[ActivityKey], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """The user's attendance records, most recently joined first"""
+        index = self.by_user.get(user_id)
+        return index.page(before, limit) if index else ([], False)
+
+    def event_users(self, event_id: str, before: Optional[ActivityKey], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """The event's attendance records, most recently joined first"""
+        index = self.by_event.get(event_id)
+        return index.page(before, limit) if index else ([], False)
+
+    def user_count(self, user_id: str) -> int:
+        index = self.by_user.get(user_id)
+        return len(index.keys) if index else 0
+
+
+# Global instance
+event_attendance = EventAttendance()
+json_store.add_observer(event_attendance)
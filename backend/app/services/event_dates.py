@@ -0,0 +1,221 @@
+import bisect
+from datetime import date, datetime, timezone
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.facets import EVENT_FACETS
+from app.services.json_store import StoreObserver, json_store
+from app.services.text import normalize
+
+DateKey = Tuple[str, str]
+# (city, category) partition; None means "any"
+Partition = Tuple[Optional[str], Optional[str]]
+# Date key of undated events: sorts after every timestamp, so they list last
+UNDATED = "~"
+
+
+def date_key(value: Any) -> str:
+    """Canonical, lexically sortable UTC timestamp for an ISO date or datetime (UNDATED if none)"""
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = str(value or "")
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return UNDATED
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def range_bound(value: Optional[str], end: bool = False) -> Optional[str]:
+    """Date key for a `from`/`to` query value; a bare date covers that whole day"""
+    if not value:
+        return None
+    try:
+        day = date.fromisoformat(value)
+    except ValueError:
+        key = date_key(value)
+        if key == UNDATED:
+            raise ValueError(f"Invalid date: {value}")
+        return key
+    return day.isoformat() + ("T23:59:59" if end else "T00:00:00")
+
+
+def event_cities(event: Dict[str, Any]) -> List[str]:
+    """City keys of an event: each comma-separated part of the location and each word in it.
+
+    "Downtown Dubai, UAE" files under "downtown dubai", "uae", "downtown" and "dubai".
+    """
+    location = event.get("city") or event.get("location") or ""
+    keys = set()
+    for part in str(location).split(","):
+        part = normalize(part.strip())
+        keys.add(part)
+        keys.update(part.split())
+    return sorted(key for key in keys if key)
+
+
+def event_category(event: Dict[str, Any]) -> str:
+    field, default = EVENT_FACETS["category"]
+    return str(event.get(field) or default)
+
+
+class EventDateIndex(StoreObserver):
+    """Events sorted by date, partitioned by city, category and both.
+
+    Every event is filed under (None, None), (None, category) and, for each
+    city key of its location, (city, None) and (city, category), so any
+    combination of filters is a bisect into one sorted key list. A page is
+    a slice, the total is the width of the range, and per-category counts
+    are one bisect pair per category. A city that is not a key (a partial
+    name, or several comma-separated parts) is resolved to a merged key
+    list once and memoized until the next write; its category filter and
+    counts then come from that list. Undated events sort last and are left
+    out of any date-bounded query.
+    """
+    collections = ("events",)
+
+    def __init__(self):
+        self.partitions: Dict[Partition, List[DateKey]] = {}
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.categories: Dict[str, str] = {}
+        self.event_categories: Dict[str, str] = {}
+        self._merged: Dict[str, List[DateKey]] = {}
+
+    def _partitions(self, event: Dict[str, Any]) -> List[Partition]:
+        category = normalize(event_category(event))
+        partitions = [(None, None), (None, category)]
+        for city in event_cities(event):
+            partitions += [(city, None), (city, category)]
+        return partitions
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        key = (date_key(event.get("date")), event.get("id"))
+        for partition in self._partitions(event):
+            bisect.insort(self.partitions.setdefault(partition, []), key)
+        self.events[event.get("id")] = event
+        self.event_categories[event.get("id")] = normalize(event_category(event))
+        self.categories.setdefault(normalize(event_category(event)), event_category(event))
+        self._merged = {}
+
+    def _remove(self, event: Dict[str, Any]) -> None:
+        key = (date_key(event.get("date")), event.get("id"))
+        for partition in self._partitions(event):
+            keys = self.partitions.get(partition, [])
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+        self.events.pop(event.get("id"), None)
+        self.event_categories.pop(event.get("id"), None)
+        self._merged = {}
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.partitions = {}
+        self.events = {}
+        self.categories = {}
+        self.event_categories = {}
+        self._merged = {}
+        for event in data.get("events", []):
+            self._add(event)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if before is not None and after is not None and self._partitions(before) == self._partitions(after) \
+                and date_key(before.get("date")) == date_key(after.get("date")):
+            return
+        if before is not None:
+            self._remove(before)
+        if after is not None:
+            self._add(after)
+
+    def _city_keys(self, city: str) -> List[DateKey]:
+        """Keys of every event in a city given by name, partial name or comma-separated parts"""
+        if (city, None) in self.partitions:
+            return self.partitions[(city, None)]
+        merged = self._merged.get(city)
+        if merged is None:
+            matches = None
+            for part in filter(None, (normalize(part.strip()) for part in city.split(","))):
+                if (part, None) in self.partitions:
+                    found = set(self.partitions[(part, None)])
+                else:
+                    found = set()
+                    for (partition_city, partition_category), keys in self.partitions.items():
+                        if partition_category is None and partition_city and part in partition_city:
+                            found.update(keys)
+                # A part no event has (a country the locations leave out) doesn't narrow the match
+                if found:
+                    matches = found if matches is None else matches & found
+            merged = self._merged[city] = sorted(matches or ())
+        return merged
+
+    def _range(self, keys: List[DateKey], start: Optional[str], end: Optional[str]) -> Tuple[int, int]:
+        if start is None and end is None:
+            return 0, len(keys)
+        lo = 0 if start is None else bisect.bisect_left(keys, start, key=itemgetter(0))
+        # A date bound never matches undated events
+        hi = bisect.bisect_left(keys, UNDATED, lo, key=itemgetter(0))
+        if end is not None:
+            hi = bisect.bisect_right(keys, end, lo, hi, key=itemgetter(0))
+        return lo, max(lo, hi)
+
+    def query(
+        self,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        city: Optional[str] = None,
+        category: Optional[str] = None,
+        after: Optional[DateKey] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Events in [from, to] ordered by date, continuing after the `after` key.
+
+        Raises ValueError for an unparseable `from` or `to`.
+        """
+        city_key = normalize(city.strip()) if city else None
+        category_key = normalize(category) if category else None
+        start = range_bound(date_from)
+        end = range_bound(date_to, end=True)
+
+        counts = {}
+        if city_key is None or (city_key, None) in self.partitions:
+            # Every filter combination is a partition of its own
+            keys = self.partitions.get((city_key, category_key), [])
+            lo, hi = self._range(keys, start, end)
+            for key, label in self.categories.items():
+                lo_c, hi_c = self._range(self.partitions.get((city_key, key), []), start, end)
+                if hi_c > lo_c:
+                    counts[label] = hi_c - lo_c
+        else:
+            city_keys = self._city_keys(city_key)
+            lo_c, hi_c = self._range(city_keys, start, end)
+            in_range = city_keys[lo_c:hi_c]
+            for _, event_id in in_range:
+                label = self.categories[self.event_categories[event_id]]
+                counts[label] = counts.get(label, 0) + 1
+            keys = in_range if category_key is None else [
+                key for key in in_range if self.event_categories[key[1]] == category_key
+            ]
+            lo, hi = 0, len(keys)
+        counts = dict(sorted(counts.items(), key=lambda pair: -pair[1]))
+
+        total = hi - lo
+        if after is not None:
+            lo = max(lo, bisect.bisect_right(keys, tuple(after)))
+        page = keys[lo:min(lo + limit, hi)]
+
+        return {
+            "events": [self.events[event_id] for _, event_id in page],
+            "total": total,
+            "category_counts": counts,
+            "last_key": page[-1] if page else None,
+            "has_more": lo + limit < hi,
+        }
+
+
+# Global instance
+event_dates = EventDateIndex()
+json_store.add_observer(event_dates)
@@ -0,0 +1,80 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.json_store import StoreObserver, json_store
+from app.services.text import normalize
+
+# Facet name -> (item field, value used when the field is missing)
+PLACE_FACETS = {"category": ("category", "Other"), "city": ("city", "Unknown")}
+EVENT_FACETS = {"category": ("category", "Other")}
+
+
+def facet_values(item: Dict[str, Any], facets: Dict[str, Tuple[str, str]]) -> Iterable[Tuple[str, str]]:
+    for name, (field, default) in facets.items():
+        yield name, str(item.get(field) or default)
+
+
+def count_facets(items: Iterable[Dict[str, Any]], facets: Dict[str, Tuple[str, str]]) -> Dict[str, Dict[str, int]]:
+    """One-pass facet counts over an already filtered result set"""
+    counts = {name: Counter() for name in facets}
+    labels: Dict[str, Dict[str, str]] = {name: {} for name in facets}
+    for item in items:
+        for name, value in facet_values(item, facets):
+            key = normalize(value)
+            labels[name].setdefault(key, value)
+            counts[name][key] += 1
+    return {name: {labels[name][key]: n for key, n in counter.most_common()} for name, counter in counts.items()}
+
+
+class FacetIndex(StoreObserver):
+    """Facet value counts for one collection, maintained on every insert, update and delete.
+
+    Values are counted on their normalized form, as the columnar search
+    filter matches them, and reported under the first spelling seen.
+    """
+
+    def __init__(self, collection_name: str, facets: Dict[str, Tuple[str, str]]):
+        self.collections = (collection_name,)
+        self.facets = facets
+        self.counts: Dict[str, Counter] = {name: Counter() for name in facets}
+        self.labels: Dict[str, Dict[str, str]] = {name: {} for name in facets}
+
+    def _add(self, item: Dict[str, Any]) -> None:
+        for name, value in facet_values(item, self.facets):
+            key = normalize(value)
+            self.labels[name].setdefault(key, value)
+            self.counts[name][key] += 1
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.counts = {name: Counter() for name in self.facets}
+        self.labels = {name: {} for name in self.facets}
+        for item in data.get(self.collections[0], []):
+            self._add(item)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if before is not None:
+            for name, value in facet_values(before, self.facets):
+                key = normalize(value)
+                counter = self.counts[name]
+                counter[key] -= 1
+                if counter[key] <= 0:
+                    del counter[key]
+                    self.labels[name].pop(key, None)
+        if after is not None:
+            self._add(after)
+
+    def values(self, name: str) -> List[str]:
+        return sorted(self.labels[name][key] for key in self.counts[name])
+
+    def top(self, name: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        return [(self.labels[name][key], count) for key, count in self.counts[name].most_common(limit)]
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(self.top(name)) for name in self.counts}
+
+
+# Global instances
+place_facets = FacetIndex("places", PLACE_FACETS)
+event_facets = FacetIndex("events", EVENT_FACETS)
+json_store.add_observer(place_facets)
+json_store.add_observer(event_facets)
@@ -0,0 +1,205 @@
+import heapq
+import math
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from app.services.json_store import StoreObserver, json_store
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+# Grid resolutions (~1 km, ~11 km and ~111 km cells at the equator)
+GRID_CELL_DEGREES = (0.01, 0.1, 1.0)
+MAX_CELL_PROBES = 1024
+
+# Collections whose items carry coordinates, and the type reported for them
+GEO_KINDS = {"places": "place", "hotels": "hotel", "events": "event"}
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def item_coordinates(item: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Read {"coordinates": {"lat", "lng"}} or top-level lat/lng from an item"""
+    source = item.get("coordinates") or item
+    try:
+        lat, lng = float(source["lat"]), float(source["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return lat, lng
+
+
+class _Grid:
+    """One resolution level of the geo index: points bucketed into lat/lng cells"""
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self.columns = int(math.ceil(360.0 / cell_degrees))
+        self.rows = int(math.ceil(180.0 / cell_degrees))
+        self.cells: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float, Any]]] = {}
+
+    def cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return self._row(lat), self._column(lng)
+
+    def _row(self, lat: float) -> int:
+        return min(max(int((lat + 90.0) / self.cell_degrees), 0), self.rows - 1)
+
+    def _column(self, lng: float) -> int:
+        return int(math.floor((lng + 180.0) / self.cell_degrees)) % self.columns
+
+    def cell_ranges(self, lat: float, lng: float, radius_km: float) -> Tuple[range, Optional[set]]:
+        """Rows and columns (None meaning all) covering the circle's bounding box"""
+        d_lat = radius_km / KM_PER_DEGREE
+        rows = range(self._row(lat - d_lat), self._row(lat + d_lat) + 1)
+
+        angular = radius_km / EARTH_RADIUS_KM
+        cos_lat = math.cos(math.radians(lat))
+        if lat - d_lat <= -90.0 or lat + d_lat >= 90.0 or angular >= math.pi / 2 or math.sin(angular) >= cos_lat:
+            return rows, None
+
+        d_lng = math.degrees(math.asin(math.sin(angular) / cos_lat))
+        if d_lng >= 180.0:
+            return rows, None
+        first, last = self._column(lng - d_lng), self._column(lng + d_lng)
+        if first <= last:
+            return rows, set(range(first, last + 1))
+        return rows, set(range(first, self.columns)) | set(range(0, last + 1))
+
+    def probe_count(self, rows: range, columns: Optional[set]) -> int:
+        return len(rows) * (len(columns) if columns is not None else self.columns)
+
+    def buckets(self, rows: range, columns: Optional[set]) -> List[Dict[Hashable, Tuple[float, float, Any]]]:
+        if self.probe_count(rows, columns) > len(self.cells):
+            # Sparse grid: walking the occupied cells is cheaper than probing the box
+            return [
+                bucket for (row, column), bucket in self.cells.items()
+                if row in rows and (columns is None or column in columns)
+            ]
+        all_columns = columns if columns is not None else range(self.columns)
+        return [self.cells[(row, column)] for row in rows for column in all_columns if (row, column) in self.cells]
+
+
+class GeoIndex:
+    """Multi-resolution lat/lng grid supporting radius and k-nearest queries.
+
+    Every point is bucketed at a few cell sizes. A radius query uses the
+    finest grid whose bounding box stays within MAX_CELL_PROBES cells, so
+    dense city centres scan small cells and wide searches scan few big ones.
+    A k-nearest query runs radius queries with a doubling radius until k
+    points are found or the radius cap is reached.
+    """
+
+    def __init__(self, cell_degrees: Tuple[float, ...] = GRID_CELL_DEGREES):
+        self.grids = [_Grid(size) for size in sorted(cell_degrees)]
+        self.points: Dict[Hashable, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def insert(self, key: Hashable, lat: float, lng: float, payload: Any = None) -> None:
+        self.remove(key)
+        self.points[key] = (lat, lng)
+        for grid in self.grids:
+            grid.cells.setdefault(grid.cell(lat, lng), {})[key] = (lat, lng, payload)
+
+    def remove(self, key: Hashable) -> None:
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        for grid in self.grids:
+            cell = grid.cell(*point)
+            bucket = grid.cells.get(cell)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del grid.cells[cell]
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[float, Hashable, Any]]:
+        """All points within `radius_km` as (distance_km, key, payload), unordered"""
+        for grid in self.grids:
+            rows, columns = grid.cell_ranges(lat, lng, radius_km)
+            if grid.probe_count(rows, columns) <= MAX_CELL_PROBES:
+                break
+
+        hits = []
+        for bucket in grid.buckets(rows, columns):
+            for key, (p_lat, p_lng, payload) in bucket.items():
+                distance = haversine_km(lat, lng, p_lat, p_lng)
+                if distance <= radius_km:
+                    hits.append((distance, key, payload))
+        return hits
+
+    def nearest(self, lat: float, lng: float, limit: int, radius_km: float) -> List[Tuple[float, Hashable, Any]]:
+        """Up to `limit` points within `radius_km`, closest first"""
+        if not self.points or limit <= 0:
+            return []
+
+        search_km = min(radius_km, self.grids[0].cell_degrees * KM_PER_DEGREE)
+        while True:
+            hits = self.within(lat, lng, search_km)
+            if len(hits) >= limit or search_km >= radius_km:
+                return heapq.nsmallest(limit, hits, key=lambda hit: hit[0])
+            search_km = min(radius_km, search_km * 2)
+
+
+def _summary(item: Dict[str, Any], item_type: str, lat: float, lng: float) -> Dict[str, Any]:
+    photos = item.get("photos") or item.get("media") or []
+    return {
+        "id": item.get("id"),
+        "type": item_type,
+        "name": item.get("name") or item.get("title") or "",
+        "city": item.get("city") or item.get("location"),
+        "image": item.get("image") or item.get("cover_photo") or (photos[0] if photos else ""),
+        "rating": item.get("rating"),
+        "coordinates": {"lat": lat, "lng": lng},
+    }
+
+
+def index_item(index: GeoIndex, item_type: str, item: Dict[str, Any]) -> None:
+    coordinates = item_coordinates(item)
+    key = (item_type, item.get("id"))
+    if coordinates is None:
+        index.remove(key)
+        return
+    index.insert(key, coordinates[0], coordinates[1], _summary(item, item_type, *coordinates))
+
+
+class StoreGeoIndex(StoreObserver):
+    """Geo index over json_store places, hotels and events, updated on every write"""
+    collections = tuple(GEO_KINDS)
+
+    def __init__(self):
+        self.index = GeoIndex()
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        index = GeoIndex()
+        for collection, item_type in GEO_KINDS.items():
+            for item in data.get(collection, []):
+                index_item(index, item_type, item)
+        self.index = index
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        item_type = GEO_KINDS[collection_name]
+        if after is None:
+            self.index.remove((item_type, before.get("id")))
+        else:
+            index_item(self.index, item_type, after)
+
+
+def build_catalog_geo_index(snapshot) -> GeoIndex:
+    """Geo index over the explore catalog (mock.json) of a snapshot"""
+    index = GeoIndex()
+    for collection, item_type in GEO_KINDS.items():
+        for item in snapshot.collection(collection):
+            index_item(index, item_type, item)
+    return index
+
+
+# Global instance
+store_geo_index = StoreGeoIndex()
+json_store.add_observer(store_geo_index)
@@ -1,15 +1,112 @@
 import json
+import os
 import asyncio
-from typing import Dict, List, Any, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 import aiofiles
 from app.core.config import settings
 
+# Relative data paths are taken from the backend directory, not the working directory
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+
+def resolve_data_path(path: str) -> Path:
+    resolved = Path(path)
+    return resolved if resolved.is_absolute() else BACKEND_DIR / resolved
+
+class StoreObserver:
+    """Base for in-memory indexes kept in sync with the store.
+
+    `rebuild` receives the whole dataset once it is loaded; `on_change` is
+    called after every write with the item before and after the change
+    (before is None for inserts, after is None for deletes).
+    """
+    collections: tuple = ()
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        pass
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        pass
+
+class WriteBatch:
+    """Mutations staged for `JSONStore.batch()`, applied together and saved once.
+
+    Nothing touches the store until the batch commits. `increment` reads the
+    current value at commit time, so concurrent counters don't lose updates.
+    Updates, increments and deletes of missing items are skipped, like
+    `update_item` returning None.
+    """
+
+    def __init__(self):
+        self.operations: List[Tuple[str, str, Any]] = []
+
+    def add(self, collection_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        self.operations.append(("add", collection_name, item))
+        return item
+
+    def update(self, collection_name: str, item_id: str, updates: Dict[str, Any]) -> None:
+        self.operations.append(("update", collection_name, (item_id, updates)))
+
+    def increment(self, collection_name: str, item_id: str, field: str, amount: int = 1) -> None:
+        self.operations.append(("increment", collection_name, (item_id, field, amount)))
+
+    def delete(self, collection_name: str, item_id: str) -> None:
+        self.operations.append(("delete", collection_name, item_id))
+
+class BulkWrite:
+    """Records loaded by `JSONStore.bulk()`, appended as they arrive and indexed once at the end.
+
+    `extend` appends straight to the store without notifying observers, so
+    an import never holds its records twice. Increments are summed and
+    applied when the block exits; then every observer of a touched
+    collection is rebuilt once and the store is saved once.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+        self.added: Dict[str, Set[int]] = {}
+        self.increments: Dict[Tuple[str, Any, str], int] = {}
+
+    def extend(self, collection_name: str, items: List[Dict[str, Any]]) -> None:
+        self._data.setdefault(collection_name, []).extend(items)
+        self.added.setdefault(collection_name, set()).update(id(item) for item in items)
+
+    def increment(self, collection_name: str, item_id: Any, field: str, amount: int = 1) -> None:
+        key = (collection_name, item_id, field)
+        self.increments[key] = self.increments.get(key, 0) + amount
+
 class JSONStore:
     def __init__(self):
-        self.data_path = Path(settings.MOCK_DATA_PATH)
+        self.data_path = resolve_data_path(settings.MOCK_DATA_PATH)
         self._lock = asyncio.Lock()
         self._data: Optional[Dict[str, Any]] = None
+        self._observers: List[StoreObserver] = []
+        self._versions: Dict[str, int] = {}
+        self._entity_versions: Dict[Tuple[str, Any], int] = {}
+    
+    def collection_version(self, collection_name: str) -> int:
+        """Counter bumped on every write to a collection, for cache invalidation"""
+        return self._versions.get(collection_name, 0)
+    
+    def entity_version(self, collection_name: str, item_id: Any) -> int:
+        """Counter bumped on every write to one item, for precise cache invalidation"""
+        return self._entity_versions.get((collection_name, item_id), 0)
+    
+    def add_observer(self, observer: StoreObserver) -> None:
+        """Register an index; it is built now if data is already loaded, else on load"""
+        self._observers.append(observer)
+        if self._data is not None:
+            observer.rebuild(self._data)
+    
+    def _notify(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+        entity = (collection_name, (after or before or {}).get("id"))
+        self._entity_versions[entity] = self._entity_versions.get(entity, 0) + 1
+        for observer in self._observers:
+            if collection_name in observer.collections:
+                observer.on_change(collection_name, before, after)
     
     async def load_data(self) -> Dict[str, Any]:
         """Load data from JSON file with caching"""
@@ -26,6 +123,8 @@ class JSONStore:
                             "posts": [], "comments": [], "events": [], "bookings": [], "trips": []
                         }
                         await self.save_data()
+                    for observer in self._observers:
+                        observer.rebuild(self._data)
         return self._data
     
     async def save_data(self) -> None:
@@ -35,8 +134,88 @@ class JSONStore:
                 # Ensure directory exists
                 self.data_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                async with aiofiles.open(self.data_path, 'w', encoding='utf-8') as f:
+                # Write a sibling file and swap it in, so a crash never leaves a half-written store
+                tmp_path = self.data_path.with_name(self.data_path.name + ".tmp")
+                async with aiofiles.open(tmp_path, 'w', encoding='utf-8') as f:
                     await f.write(json.dumps(self._data, indent=2, ensure_ascii=False))
+                os.replace(tmp_path, self.data_path)
+    
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[WriteBatch]:
+        """Stage several writes and apply them atomically with a single save.
+
+        If the block raises, nothing is applied.
+        """
+        batch = WriteBatch()
+        yield batch
+        await self.commit(batch)
+    
+    async def commit(self, batch: WriteBatch) -> None:
+        """Apply a write batch in memory in one step, then persist once"""
+        data = await self.load_data()
+        
+        # No awaits between here and the save, so other requests never observe a partial batch
+        for kind, collection_name, payload in batch.operations:
+            items = data.setdefault(collection_name, [])
+            if kind == "add":
+                items.append(payload)
+                self._notify(collection_name, None, payload)
+                continue
+            
+            item_id = payload if kind == "delete" else payload[0]
+            index = next((i for i, item in enumerate(items) if item.get("id") == item_id), None)
+            if index is None:
+                continue
+            before = dict(items[index])
+            if kind == "delete":
+                del items[index]
+                self._notify(collection_name, before, None)
+                continue
+            if kind == "update":
+                items[index].update(payload[1])
+            else:
+                _, field, amount = payload
+                items[index][field] = (items[index].get(field) or 0) + amount
+            self._notify(collection_name, before, items[index])
+        
+        if batch.operations:
+            await self.save_data()
+    
+    @asynccontextmanager
+    async def bulk(self) -> AsyncIterator[BulkWrite]:
+        """Load many records with one index rebuild and a single save.
+
+        If the block raises, the records it appended are taken out again.
+        """
+        data = await self.load_data()
+        bulk = BulkWrite(data)
+        try:
+            yield bulk
+        except BaseException:
+            for collection_name, added in bulk.added.items():
+                items = data.get(collection_name, [])
+                items[:] = [item for item in items if id(item) not in added]
+            raise
+        
+        counters: Dict[str, Dict[Any, List[Tuple[str, int]]]] = {}
+        for (collection_name, item_id, field), amount in bulk.increments.items():
+            counters.setdefault(collection_name, {}).setdefault(item_id, []).append((field, amount))
+        for collection_name, by_id in counters.items():
+            for item in data.get(collection_name, []):
+                for field, amount in by_id.get(item.get("id"), ()):
+                    item[field] = (item.get(field) or 0) + amount
+            for item_id in by_id:
+                entity = (collection_name, item_id)
+                self._entity_versions[entity] = self._entity_versions.get(entity, 0) + 1
+        
+        touched = set(bulk.added) | set(counters)
+        for collection_name in touched:
+            self._versions[collection_name] = self._versions.get(collection_name, 0) + 1
+        for observer in self._observers:
+            if touched.intersection(observer.collections):
+                observer.rebuild(data)
+        if touched:
+            await self.save_data()
     
     async def get_collection(self, collection_name: str) -> List[Dict[str, Any]]:
         """Get all items from a collection"""
@@ -55,6 +234,7 @@ class JSONStore:
             data[collection_name] = []
         
         data[collection_name].append(item)
+        self._notify(collection_name, None, item)
         await self.save_data()
         return item
     
@@ -65,7 +245,9 @@ class JSONStore:
         
         for i, item in enumerate(items):
             if item.get("id") == item_id:
+                before = dict(item)
                 items[i].update(updates)
+                self._notify(collection_name, before, items[i])
                 await self.save_data()
                 return items[i]
         return None
@@ -78,6 +260,7 @@ class JSONStore:
         for i, item in enumerate(items):
             if item.get("id") == item_id:
                 del items[i]
+                self._notify(collection_name, item, None)
                 await self.save_data()
                 return True
         return False
@@ -0,0 +1,191 @@
+import os
+import stat
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Mapping
+
+import aiofiles
+from starlette.responses import Response
+from starlette.types import Scope, Receive, Send
+
+from app.core.config import settings
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class MediaFile:
+    """A resolved media asset with the metadata needed for HTTP caching"""
+
+    def __init__(self, path: Path, stat_result: os.stat_result):
+        self.path = path
+        self.size = stat_result.st_size
+        self.mtime = stat_result.st_mtime
+        self.etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+        self.last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        self.media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+def cache_headers(media: MediaFile) -> Dict[str, str]:
+    """Validators and caching policy shared by full, partial and 304 responses"""
+    return {
+        "etag": media.etag,
+        "last-modified": media.last_modified,
+        "cache-control": f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}",
+    }
+
+
+def resolve_media_file(relative_path: str) -> Optional[MediaFile]:
+    """Resolve a request path inside MEDIA_ROOT, refusing anything that escapes it"""
+    root = Path(settings.MEDIA_ROOT).resolve()
+    try:
+        path = (root / relative_path).resolve()
+        path.relative_to(root)
+        stat_result = path.stat()
+    except (ValueError, OSError):
+        return None
+
+    if not stat.S_ISREG(stat_result.st_mode):
+        return None
+    return MediaFile(path, stat_result)
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into an inclusive (start, end) pair.
+
+    Returns None when the header should be ignored (absent, malformed or
+    multi-range, which RFC 7233 lets us answer with the full body) and
+    raises ValueError when the range cannot be satisfied.
+    """
+    if not range_header:
+        return None
+
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    first, sep, last = ranges.strip().partition("-")
+    if not sep:
+        return None
+
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # Suffix range: the final N bytes
+        if end is None:
+            return None
+        if end <= 0 or size == 0:
+            raise ValueError("Unsatisfiable suffix range")
+        return max(size - end, 0), size - 1
+
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Range start beyond end of file")
+    if end is None:
+        end = size - 1
+    return start, min(end, size - 1)
+
+
+def is_not_modified(media: MediaFile, headers: Mapping[str, str]) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the asset"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        tags = [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+        return "*" in tags or media.etag in tags
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(media.mtime) <= since
+    return False
+
+
+def range_is_current(media: MediaFile, headers: Mapping[str, str]) -> bool:
+    """Honour If-Range: only serve a partial body if the validator still matches"""
+    if_range = headers.get("if-range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return if_range == media.etag
+    return if_range == media.last_modified
+
+
+class MediaFileResponse(Response):
+    """Streams a (possibly partial) file, using zero-copy send when the server offers it"""
+
+    def __init__(
+        self,
+        media: MediaFile,
+        status_code: int = 200,
+        byte_range: Optional[Tuple[int, int]] = None,
+        send_body: bool = True,
+    ) -> None:
+        self.media = media
+        self.status_code = status_code
+        self.media_type = media.media_type
+        self.background = None
+        self.send_body = send_body
+
+        if byte_range is None:
+            self.offset, self.count = 0, media.size
+        else:
+            self.offset, self.count = byte_range[0], byte_range[1] - byte_range[0] + 1
+
+        headers = {
+            **cache_headers(media),
+            "accept-ranges": "bytes",
+            "content-length": str(self.count),
+        }
+        if byte_range is not None:
+            headers["content-range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{media.size}"
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+
+        if not self.send_body or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.media.path, "rb") as file:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False,
+                })
+            return
+
+        chunk_size = settings.MEDIA_CHUNK_SIZE
+        remaining = self.count
+        async with aiofiles.open(self.media.path, "rb") as file:
+            await file.seek(self.offset)
+            while remaining > 0:
+                chunk = await file.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+        if remaining > 0:
+            # File shrank underneath us; close the body so the client isn't left hanging
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
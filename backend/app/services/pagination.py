@@ -0,0 +1,117 @@
+import base64
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Compact list projection shared by catalog list endpoints
+CARD_FIELDS = ("id", "name", "image", "rating", "price")
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode an opaque cursor; raises ValueError if it was not produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
+
+
+def encode_key_cursor(key: Tuple[str, str]) -> str:
+    """Cursor for keyset pages ordered by (timestamp, id)"""
+    return encode_cursor({"at": key[0], "id": key[1]})
+
+
+def decode_key_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """The (timestamp, id) key a page continues after, or None for the first page"""
+    if not cursor:
+        return None
+    payload = decode_cursor(cursor)
+    try:
+        return (str(payload["at"]), str(payload["id"]))
+    except KeyError as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Turn `fields=id,name` (or the `card` shorthand) into a field tuple; None means everything"""
+    if not fields:
+        return None
+    if fields.strip() == "card":
+        return CARD_FIELDS
+    return tuple(field.strip() for field in fields.split(",") if field.strip())
+
+
+def project(item: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return item
+    return {field: item.get(field) for field in fields}
+
+
+def card(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Card view: id, name, image, rating and price, falling back to common aliases"""
+    photos = item.get("photos") or item.get("media") or []
+    return {
+        "id": item.get("id"),
+        "name": item.get("name") or item.get("title"),
+        "image": item.get("image") or item.get("cover_photo") or (photos[0] if photos else None),
+        "rating": item.get("rating"),
+        "price": item.get("price"),
+    }
+
+
+class SnapshotPager:
+    """Keyset pagination over an immutable, ordered list of items.
+
+    Cursors carry the snapshot version, the next offset and the last id
+    served. While the snapshot is unchanged the offset is used directly; after
+    a reload the cursor is re-anchored on the last id so pages don't skip or
+    repeat items.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], version: int):
+        self.items = items
+        self.version = version
+        self.positions = {item.get("id"): position for position, item in enumerate(items)}
+        self.cards = [card(item) for item in items]
+
+    def _start(self, cursor: Optional[str]) -> int:
+        if not cursor:
+            return 0
+        payload = decode_cursor(cursor)
+        if payload.get("v") == self.version and isinstance(payload.get("o"), int):
+            return max(payload["o"], 0)
+        after = payload.get("after")
+        if not isinstance(after, str):
+            raise ValueError("Invalid cursor")
+        position = self.positions.get(after)
+        if position is None:
+            raise ValueError("Cursor no longer valid")
+        return position + 1
+
+    def page(self, cursor: Optional[str], limit: int, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        start = min(self._start(cursor), len(self.items))
+        end = min(start + limit, len(self.items))
+        if fields == CARD_FIELDS:
+            data: Iterable[Dict[str, Any]] = self.cards[start:end]
+        else:
+            data = [project(item, fields) for item in self.items[start:end]]
+
+        has_more = end < len(self.items)
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor({"v": self.version, "o": end, "after": self.items[end - 1].get("id")})
+
+        return {
+            "data": list(data),
+            "count": end - start,
+            "total": len(self.items),
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
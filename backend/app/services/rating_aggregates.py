@@ -0,0 +1,80 @@
+from typing import Any, Dict, Iterable, Optional
+
+from app.services.json_store import StoreObserver, json_store
+
+RATING_VALUES = range(1, 6)
+
+
+class RatingStats:
+    """Running sum, count and 1-5 histogram for one place"""
+    __slots__ = ("total", "count", "histogram")
+
+    def __init__(self):
+        self.total = 0
+        self.count = 0
+        self.histogram = [0] * (len(RATING_VALUES) + 1)
+
+    def add(self, rating: int, sign: int = 1) -> None:
+        self.total += sign * rating
+        self.count += sign
+        self.histogram[rating] += sign
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calculated_rating": round(self.total / self.count, 2) if self.count else None,
+            "rating_count": self.count,
+            "rating_distribution": {str(value): self.histogram[value] for value in RATING_VALUES},
+        }
+
+
+def _rating(checkin: Optional[Dict[str, Any]]) -> Optional[int]:
+    if not checkin:
+        return None
+    try:
+        rating = int(checkin.get("rating") or 0)
+    except (TypeError, ValueError):
+        return None
+    return rating if rating in RATING_VALUES else None
+
+
+class PlaceRatingAggregates(StoreObserver):
+    """Per-place rating aggregates kept current as check-ins are written"""
+    collections = ("checkins",)
+
+    def __init__(self):
+        self.places: Dict[str, RatingStats] = {}
+
+    def backfill(self, checkins: Iterable[Dict[str, Any]]) -> None:
+        """Seed the aggregates from existing check-ins (run on every store load)"""
+        places: Dict[str, RatingStats] = {}
+        for checkin in checkins:
+            rating = _rating(checkin)
+            if rating is not None:
+                places.setdefault(checkin.get("place_id"), RatingStats()).add(rating)
+        self.places = places
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.backfill(data.get("checkins", []))
+
+    def _apply(self, checkin: Optional[Dict[str, Any]], sign: int) -> None:
+        rating = _rating(checkin)
+        if rating is None:
+            return
+        place_id = checkin.get("place_id")
+        stats = self.places.setdefault(place_id, RatingStats())
+        stats.add(rating, sign)
+        if stats.count <= 0:
+            del self.places[place_id]
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        self._apply(before, -1)
+        self._apply(after, 1)
+
+    def get(self, place_id: str) -> Dict[str, Any]:
+        stats = self.places.get(place_id)
+        return (stats or RatingStats()).as_dict()
+
+
+# Global instance
+place_ratings = PlaceRatingAggregates()
+json_store.add_observer(place_ratings)
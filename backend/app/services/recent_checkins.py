@@ -0,0 +1,146 @@
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.json_store import StoreObserver, json_store
+from app.services.user_profiles import OrderedItems
+
+FeedKey = Tuple[str, str]
+
+
+def checkin_key(checkin: Dict[str, Any]) -> FeedKey:
+    """Feed order: newest created_at first, ties broken by id"""
+    return (checkin.get("created_at") or "", checkin.get("id") or "")
+
+
+def user_summary(user: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not user:
+        return None
+    return {"username": user.get("username"), "avatar": user.get("avatar"), "full_name": user.get("full_name")}
+
+
+def place_summary(place: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not place:
+        return None
+    return {"name": place.get("name"), "city": place.get("city"), "cover_photo": place.get("cover_photo")}
+
+
+def enrich(checkin: Dict[str, Any], user: Optional[Dict[str, Any]], place: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    enriched = dict(checkin)
+    if user:
+        enriched["user"] = user
+    if place:
+        enriched["place"] = place
+    return enriched
+
+
+class RecentCheckinsFeed(StoreObserver):
+    """Bounded buffer of the newest check-ins with their user and place summaries.
+
+    Entries keep a reference to the stored check-in (so like and comment
+    counters stay current) next to summaries captured when it was written.
+    Pages inside the buffer are a slice; anything older than the buffer is
+    a bisect into the index of every check-in ordered by (created_at, id).
+    Users and places are mirrored by id for the summaries.
+    """
+    collections = ("checkins", "users", "places")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: Deque[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = deque(maxlen=capacity)
+        self.index = OrderedItems()
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.places: Dict[str, Dict[str, Any]] = {}
+
+    def _summaries(self, checkin: Dict[str, Any]):
+        return user_summary(self.users.get(checkin.get("user_id"))), place_summary(self.places.get(checkin.get("place_id")))
+
+    @property
+    def total(self) -> int:
+        return len(self.index.keys)
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.users = {u.get("id"): u for u in data.get("users", [])}
+        self.places = {p.get("id"): p for p in data.get("places", [])}
+        self.index = OrderedItems()
+        for checkin in data.get("checkins", []):
+            self.index.add(checkin)
+        self._refill()
+
+    def _refill(self) -> None:
+        newest, _ = self.index.page(None, self.capacity)
+        self.entries = deque(((c, *self._summaries(c)) for c in newest), maxlen=self.capacity)
+
+    def _insert(self, checkin: Dict[str, Any]) -> None:
+        if not self.entries and self.total > 1:
+            # Deletes emptied the buffer while the store still has check-ins; reload the newest
+            self._refill()
+            return
+        key = checkin_key(checkin)
+        entry = (checkin, *self._summaries(checkin))
+        if not self.entries or key >= checkin_key(self.entries[0][0]):
+            self.entries.appendleft(entry)
+            return
+        # Older than the tail while the store holds check-ins outside the buffer: the
+        # store fallback serves it, and the tail must not move past check-ins it skipped
+        holds_all = len(self.entries) >= self.total - 1
+        if not holds_all and key < checkin_key(self.entries[-1][0]):
+            return
+        # Out-of-order write (e.g. an import): place it by key, or leave it to the store if too old
+        position = next((i for i, (c, _, _) in enumerate(self.entries) if checkin_key(c) < key), len(self.entries))
+        if position >= self.capacity:
+            return
+        if len(self.entries) == self.capacity:
+            self.entries.pop()
+        self.entries.insert(position, entry)
+
+    def _remove(self, checkin_id: Optional[str]) -> None:
+        for entry in self.entries:
+            if entry[0].get("id") == checkin_id:
+                self.entries.remove(entry)
+                return
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if collection_name != "checkins":
+            mirror = self.users if collection_name == "users" else self.places
+            if before is not None:
+                mirror.pop(before.get("id"), None)
+            if after is not None:
+                mirror[after.get("id")] = after
+            return
+        if before is None and after is not None:
+            self.index.add(after)
+            self._insert(after)
+        elif after is None and before is not None:
+            self.index.remove(before)
+            self._remove(before.get("id"))
+        elif before is not None and after is not None and checkin_key(before) != checkin_key(after):
+            # Re-dated in place: move it in both the index and the buffer
+            self.index.remove(before)
+            self.index.add(after)
+            self._remove(before.get("id"))
+            self._insert(after)
+
+    def page(self, before: Optional[FeedKey], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Up to `limit` enriched check-ins strictly older than `before`, newest first"""
+        page = []
+        for checkin, user, place in self.entries:
+            if before is not None and checkin_key(checkin) >= before:
+                continue
+            if len(page) > limit:
+                break
+            page.append(enrich(checkin, user, place))
+
+        # The buffer is exhausted but the store holds older check-ins
+        if len(page) <= limit and self.total > len(self.entries):
+            oldest = checkin_key(self.entries[-1][0]) if self.entries else None
+            bound = min(k for k in (before, oldest) if k is not None) if (before or oldest) else None
+            older, _ = self.index.page(bound, limit + 1 - len(page))
+            page.extend(enrich(c, *self._summaries(c)) for c in older)
+
+        return page[:limit], len(page) > limit
+
+
+# Global instance
+recent_checkins = RecentCheckinsFeed(settings.RECENT_CHECKINS_BUFFER)
+json_store.add_observer(recent_checkins)
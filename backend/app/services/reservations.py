@@ -0,0 +1,121 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.json_store import StoreObserver, json_store
+
+# Outcomes of EventReservations.reserve
+RESERVED = "reserved"
+ALREADY_JOINED = "already_joined"
+FULL = "full"
+NOT_FOUND = "not_found"
+
+DEFAULT_CAPACITY = 999
+
+
+def attendance_id(event_id: str, user_id: str) -> str:
+    """Deterministic store id, so a user holds at most one seat per event"""
+    return f"{event_id}:{user_id}"
+
+
+class EventReservations(StoreObserver):
+    """Seat bookkeeping for events, mirrored from `events` and `event_attendees`.
+
+    `reserve` checks and takes a seat with no await in between, so on the
+    event loop it is atomic: concurrent joins can never push an event past
+    `max_attendees`, and a user already in the attendee set just gets their
+    seat back. Reservations are held as pending and written by `flush`,
+    which commits everything pending in one batch; joins that arrive while
+    a flush is saving are picked up by the same flush's next round, so a
+    burst of joins costs a handful of saves rather than one per join.
+
+    The stored `attendees` field counts persisted seats (seed events carry
+    a count with no attendee records), so the seats taken are that count
+    plus the pending reservations.
+    """
+    collections = ("events", "event_attendees")
+
+    def __init__(self):
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.attendees: Dict[str, Set[str]] = {}
+        self.pending: Dict[str, Dict[str, str]] = {}
+        self._flushing = False
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.events = {event.get("id"): event for event in data.get("events", [])}
+        self.attendees = {}
+        for record in data.get("event_attendees", []):
+            self.attendees.setdefault(record.get("event_id"), set()).add(record.get("user_id"))
+        # Reservations not yet flushed are still held
+        for event_id, users in self.pending.items():
+            self.attendees.setdefault(event_id, set()).update(users)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if collection_name == "events":
+            if before is not None:
+                self.events.pop(before.get("id"), None)
+            if after is not None:
+                self.events[after.get("id")] = after
+            return
+        if before is not None:
+            self.attendees.get(before.get("event_id"), set()).discard(before.get("user_id"))
+        if after is not None:
+            event_id, user_id = after.get("event_id"), after.get("user_id")
+            self.attendees.setdefault(event_id, set()).add(user_id)
+            # Persisted now: the event's stored count takes over from the pending entry
+            self.pending.get(event_id, {}).pop(user_id, None)
+
+    def taken(self, event_id: str) -> int:
+        event = self.events.get(event_id) or {}
+        return (event.get("attendees") or 0) + len(self.pending.get(event_id, {}))
+
+    def capacity(self, event_id: str) -> int:
+        event = self.events.get(event_id) or {}
+        capacity = event.get("max_attendees")
+        return DEFAULT_CAPACITY if capacity is None else capacity
+
+    def is_attending(self, event_id: str, user_id: str) -> bool:
+        return user_id in self.attendees.get(event_id, ())
+
+    def reserve(self, event_id: str, user_id: str) -> Tuple[str, int]:
+        """Take a seat for the user; returns the outcome and the seats now taken"""
+        if event_id not in self.events:
+            return NOT_FOUND, 0
+        if self.is_attending(event_id, user_id):
+            return ALREADY_JOINED, self.taken(event_id)
+        if self.taken(event_id) >= self.capacity(event_id):
+            return FULL, self.taken(event_id)
+        self.attendees.setdefault(event_id, set()).add(user_id)
+        self.pending.setdefault(event_id, {})[user_id] = datetime.utcnow().isoformat()
+        return RESERVED, self.taken(event_id)
+
+    def _pending_records(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        return [
+            (event_id, [
+                {"id": attendance_id(event_id, user_id), "event_id": event_id, "user_id": user_id, "created_at": created_at}
+                for user_id, created_at in users.items()
+            ])
+            for event_id, users in self.pending.items() if users
+        ]
+
+    async def flush(self) -> None:
+        """Persist every pending reservation, one batch per round, until none are left"""
+        if self._flushing:
+            return
+        self._flushing = True
+        try:
+            while True:
+                rounds = self._pending_records()
+                if not rounds:
+                    return
+                async with json_store.batch() as batch:
+                    for event_id, records in rounds:
+                        for record in records:
+                            batch.add("event_attendees", record)
+                        batch.increment("events", event_id, "attendees", len(records))
+        finally:
+            self._flushing = False
+
+
+# Global instance
+event_reservations = EventReservations()
+json_store.add_observer(event_reservations)
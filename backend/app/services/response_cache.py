@@ -0,0 +1,101 @@
+import json
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from app.core.config import settings
+from app.services.catalog import catalog_store
+from app.services.json_store import StoreObserver, json_store
+from app.services.result_cache import ResultCache, result_caches
+
+# (collection, id) of an entity a response was built from; CATALOG stands for the mock.json snapshot
+Dependency = Tuple[str, Any]
+CATALOG: Dependency = ("catalog", None)
+
+# Writes to these collections show up in another entity's detail response: collection -> (entity collection, id field)
+RELATED_ENTITIES = {
+    "checkins": (("users", "user_id"), ("places", "place_id")),
+    "posts": (("users", "user_id"),),
+    "bookings": (("users", "user_id"),),
+    "saved_places": (("places", "place_id"),),
+    "comments": (("reels", "reel_id"),),
+    "event_attendees": (("users", "user_id"), ("events", "event_id")),
+}
+
+
+class RelatedVersions(StoreObserver):
+    """Bumps the version of the entities a write is attached to (a check-in's user and place, a comment's reel)"""
+    collections = tuple(RELATED_ENTITIES)
+
+    def __init__(self):
+        self.versions = {}
+        self.epoch = 0
+
+    def rebuild(self, data) -> None:
+        # Loads bypass on_change; start a new epoch so nothing cached survives them
+        self.epoch += 1
+
+    def on_change(self, collection_name: str, before, after) -> None:
+        for item in (before, after):
+            if item:
+                for collection, field in RELATED_ENTITIES[collection_name]:
+                    key = (collection, item.get(field))
+                    self.versions[key] = self.versions.get(key, 0) + 1
+
+    def version(self, dependency: Dependency) -> Tuple[int, int]:
+        return (self.epoch, self.versions.get(dependency, 0))
+
+
+def dependency_version(dependency: Dependency) -> Hashable:
+    if dependency == CATALOG:
+        return catalog_store.snapshot().version
+    collection, item_id = dependency
+    return (json_store.entity_version(collection, item_id), *related_versions.version(dependency))
+
+
+def serialize(payload: Any) -> bytes:
+    """Encode a response body exactly as JSONResponse would"""
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def json_bytes(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+class ResponseCache(ResultCache):
+    """Pre-serialized detail responses, valid while the entities they were built from are unchanged.
+
+    Each entry records its dependencies. A lookup recomputes their current
+    versions, so a write to the entity, or to anything attached to it,
+    invalidates exactly the responses that include it. A hit returns the
+    stored bytes with no model validation or JSON encoding.
+    """
+
+    def _versions(self, dependencies: Iterable[Dependency]) -> Hashable:
+        return tuple(dependency_version(dependency) for dependency in dependencies)
+
+    def lookup(self, key: Hashable) -> Optional[Response]:
+        entry = self._entries.get(key)
+        dependencies = entry[2][0] if entry else ()
+        cached = self.get(key, self._versions(dependencies))
+        return json_bytes(cached[1]) if cached is not None else None
+
+    def store(self, key: Hashable, dependencies: Iterable[Dependency], payload: Any) -> Response:
+        dependencies = tuple(dependencies)
+        body = serialize(payload)
+        self.set(key, self._versions(dependencies), (dependencies, body))
+        return json_bytes(body)
+
+
+# Global instances
+related_versions = RelatedVersions()
+json_store.add_observer(related_versions)
+response_cache = ResponseCache("responses", settings.RESULT_CACHE_MAX_ENTRIES, settings.RESULT_CACHE_TTL_SECONDS)
+result_caches[response_cache.name] = response_cache
@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class ResultCache:
+    """Bounded LRU cache with TTL whose entries are tagged with a data version.
+
+    A lookup only hits when the stored version equals the caller's current
+    version (catalog snapshot or store collection versions), so writes and
+    reloads invalidate stale results without any explicit purge.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        entry_version, expires_at, value = entry
+        if entry_version != version:
+            self.invalidations += 1
+        elif expires_at < time.monotonic():
+            self.expirations += 1
+        else:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, version: Hashable, value: Any) -> Any:
+        self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# Registry of named caches, exposed through /health/cache
+result_caches: Dict[str, ResultCache] = {}
+
+
+def create_cache(name: str, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None) -> ResultCache:
+    cache = ResultCache(
+        name,
+        max_entries if max_entries is not None else settings.RESULT_CACHE_MAX_ENTRIES,
+        ttl_seconds if ttl_seconds is not None else settings.RESULT_CACHE_TTL_SECONDS,
+    )
+    result_caches[name] = cache
+    return cache
@@ -0,0 +1,105 @@
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.json_store import StoreObserver, json_store
+
+
+def saved_place_id(user_id: str, place_id: str) -> str:
+    """Deterministic store id, so a user can save a place at most once"""
+    return f"{user_id}:{place_id}"
+
+
+class _UserSaved:
+    """One user's saved places: a dict for membership plus a (saved_at, place_id) list for paging"""
+    __slots__ = ("saved_at", "order")
+
+    def __init__(self):
+        self.saved_at: Dict[str, str] = {}
+        self.order: List[Tuple[str, str]] = []
+
+    def add(self, place_id: str, saved_at: str) -> None:
+        if place_id in self.saved_at:
+            self.remove(place_id)
+        self.saved_at[place_id] = saved_at
+        bisect.insort(self.order, (saved_at, place_id))
+
+    def remove(self, place_id: str) -> None:
+        saved_at = self.saved_at.pop(place_id, None)
+        if saved_at is None:
+            return
+        position = bisect.bisect_left(self.order, (saved_at, place_id))
+        if position < len(self.order) and self.order[position] == (saved_at, place_id):
+            del self.order[position]
+
+
+class SavedPlacesIndex(StoreObserver):
+    """Per-user saved place sets kept in sync with the `saved_places` collection.
+
+    Membership and per-place counts are dict lookups, so toggling a save and
+    flagging a whole page of places as saved cost O(1) per place. Listings
+    walk a per-user list ordered by save time, newest first.
+    """
+    collections = ("saved_places",)
+
+    def __init__(self):
+        self.users: Dict[str, _UserSaved] = {}
+        self.counts: Dict[str, int] = {}
+
+    def _apply(self, record: Optional[Dict[str, Any]], sign: int) -> None:
+        if not record:
+            return
+        user_id, place_id = record.get("user_id"), record.get("place_id")
+        saved = self.users.setdefault(user_id, _UserSaved())
+        if sign > 0:
+            if place_id not in saved.saved_at:
+                self.counts[place_id] = self.counts.get(place_id, 0) + 1
+            saved.add(place_id, record.get("created_at") or "")
+        elif place_id in saved.saved_at:
+            saved.remove(place_id)
+            self.counts[place_id] -= 1
+            if not self.counts[place_id]:
+                del self.counts[place_id]
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.users = {}
+        self.counts = {}
+        for record in data.get("saved_places", []):
+            self._apply(record, 1)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        self._apply(before, -1)
+        self._apply(after, 1)
+
+    def is_saved(self, user_id: Optional[str], place_id: str) -> bool:
+        saved = self.users.get(user_id)
+        return saved is not None and place_id in saved.saved_at
+
+    def saved_among(self, user_id: Optional[str], place_ids: Iterable[str]) -> Set[str]:
+        """Which of a page of places the user has saved, with one user lookup"""
+        saved = self.users.get(user_id)
+        if saved is None:
+            return set()
+        return {place_id for place_id in place_ids if place_id in saved.saved_at}
+
+    def count(self, place_id: str) -> int:
+        return self.counts.get(place_id, 0)
+
+    def page(self, user_id: str, before: Optional[Tuple[str, str]], limit: int) -> Tuple[List[Tuple[str, str]], bool]:
+        """Saved (saved_at, place_id) pairs newest first, strictly older than the `before` key"""
+        saved = self.users.get(user_id)
+        if saved is None:
+            return [], False
+        end = len(saved.order) if before is None else bisect.bisect_left(saved.order, tuple(before))
+        start = max(end - limit, 0)
+        return saved.order[start:end][::-1], start > 0
+
+
+def mark_saved(items: List[Dict[str, Any]], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    """Copies of a page of places with `saved_by_me` set, computed in one pass"""
+    saved = saved_places.saved_among(user_id, (item.get("id") for item in items))
+    return [{**item, "saved_by_me": item.get("id") in saved} for item in items]
+
+
+# Global instance
+saved_places = SavedPlacesIndex()
+json_store.add_observer(saved_places)
@@ -0,0 +1,236 @@
+import heapq
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Tuple
+
+from app.services.text import tokenize
+
+# Field weights for BM25F-style scoring; titles matter more than where or what
+FIELD_WEIGHTS = {"name": 2.0, "title": 2.0, "location": 1.5, "city": 1.5, "category": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# How strongly an item's rating (0-5) lifts its text relevance
+RATING_WEIGHT = 0.5
+# Prefix expansion of the last query token (search-as-you-type)
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 32
+PREFIX_FACTOR = 0.8
+# Typo tolerance: trigram candidates are verified with a bounded edit distance
+MIN_FUZZY_LENGTH = 4
+MIN_TRIGRAM_SIMILARITY = 0.3
+MAX_FUZZY_CANDIDATES = 64
+MAX_FUZZY_EXPANSIONS = 8
+FUZZY_FACTOR = 0.6
+
+def trigrams(term: str) -> set:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edit_distance(term: str) -> int:
+    return 1 if len(term) <= 5 else 2
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up with limit + 1 as soon as it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def parse_rating(value: Any) -> float:
+    try:
+        return float(value) if value is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class SearchIndex:
+    """Inverted index with impact-ordered postings over catalog documents.
+
+    Each term keeps its documents sorted by (BM25 impact x rating boost), so a
+    single-term query is answered by reading the head of one or a few posting
+    lists instead of scoring every match.
+    """
+
+    def __init__(self, documents: List[Tuple[str, Dict[str, Any]]]):
+        self.documents = documents
+        self.boosts: List[float] = []
+        self.impacts: Dict[str, Dict[int, float]] = {}
+        self.postings: Dict[str, List[int]] = {}
+        self.vocabulary: List[str] = []
+        self.trigram_terms: Dict[str, List[int]] = {}
+        self._build()
+
+    def _build(self) -> None:
+        term_freqs: Dict[str, Dict[int, float]] = defaultdict(dict)
+        lengths: List[float] = []
+
+        for doc_id, (_, item) in enumerate(self.documents):
+            length = 0.0
+            for field, weight in FIELD_WEIGHTS.items():
+                value = item.get(field)
+                if not value:
+                    continue
+                tokens = tokenize(str(value))
+                length += weight * len(tokens)
+                for token in tokens:
+                    freqs = term_freqs[token]
+                    freqs[doc_id] = freqs.get(doc_id, 0.0) + weight
+            lengths.append(length)
+            self.boosts.append(1.0 + RATING_WEIGHT * parse_rating(item.get("rating")) / 5.0)
+
+        total = len(self.documents)
+        average_length = (sum(lengths) / total) if total else 0.0
+
+        for term, freqs in term_freqs.items():
+            df = len(freqs)
+            idf = math.log(1.0 + (total - df + 0.5) / (df + 0.5))
+            impacts = {}
+            for doc_id, tf in freqs.items():
+                norm = 1.0 - BM25_B + BM25_B * (lengths[doc_id] / average_length if average_length else 1.0)
+                impacts[doc_id] = idf * tf * (BM25_K1 + 1.0) / (tf + BM25_K1 * norm)
+            self.impacts[term] = impacts
+            self.postings[term] = sorted(impacts, key=lambda d: impacts[d] * self.boosts[d], reverse=True)
+
+        self.vocabulary = sorted(self.impacts)
+
+        trigram_terms: Dict[str, List[int]] = defaultdict(list)
+        for term_id, term in enumerate(self.vocabulary):
+            for gram in trigrams(term):
+                trigram_terms[gram].append(term_id)
+        self.trigram_terms = dict(trigram_terms)
+
+    def _prefix_terms(self, prefix: str) -> List[str]:
+        start = bisect_left(self.vocabulary, prefix)
+        terms = []
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        if len(terms) > MAX_PREFIX_EXPANSIONS:
+            terms = heapq.nlargest(MAX_PREFIX_EXPANSIONS, terms, key=lambda t: len(self.impacts[t]))
+        return terms
+
+    def _fuzzy_terms(self, token: str) -> List[Tuple[str, float]]:
+        """Vocabulary terms within a small edit distance, found via shared trigrams"""
+        grams = trigrams(token)
+        limit = max_edit_distance(token)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for term_id in self.trigram_terms.get(gram, ()):
+                shared[term_id] += 1
+
+        candidates = []
+        for term_id, count in shared.items():
+            term = self.vocabulary[term_id]
+            if abs(len(term) - len(token)) > limit:
+                continue
+            similarity = count / (len(grams) + len(term) + 1 - count)
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                candidates.append((similarity, term))
+
+        matches = []
+        for similarity, term in heapq.nlargest(MAX_FUZZY_CANDIDATES, candidates):
+            distance = bounded_edit_distance(token, term, limit)
+            if distance <= limit:
+                matches.append((distance, -len(self.impacts[term]), term))
+        matches.sort()
+        return [
+            (term, FUZZY_FACTOR * (1.0 - distance / len(token)))
+            for distance, _, term in matches[:MAX_FUZZY_EXPANSIONS]
+        ]
+
+    def expand(self, token: str, is_last: bool) -> List[Tuple[str, float]]:
+        """Index terms a query token may match, each with a score factor"""
+        expansions = {}
+        if token in self.impacts:
+            expansions[token] = 1.0
+        if is_last and len(token) >= MIN_PREFIX_LENGTH:
+            for term in self._prefix_terms(token):
+                expansions.setdefault(term, PREFIX_FACTOR)
+        if not expansions and len(token) >= MIN_FUZZY_LENGTH:
+            expansions.update(self._fuzzy_terms(token))
+        return list(expansions.items())
+
+    def _ranked(self, term: str, factor: float) -> Iterator[Tuple[float, int]]:
+        impacts = self.impacts[term]
+        boosts = self.boosts
+        for doc_id in self.postings[term]:
+            yield -impacts[doc_id] * factor * boosts[doc_id], doc_id
+
+    def _stream(self, group: List[Tuple[str, float]]) -> Iterator[Tuple[float, int]]:
+        """Documents matching any term of a group, best first, without duplicates"""
+        streams = [self._ranked(term, factor) for term, factor in group]
+        seen = set()
+        for neg_score, doc_id in heapq.merge(*streams):
+            if doc_id not in seen:
+                seen.add(doc_id)
+                yield -neg_score, doc_id
+
+    def _group_score(self, group: List[Tuple[str, float]], doc_id: int) -> float:
+        best = 0.0
+        for term, factor in group:
+            impact = self.impacts[term].get(doc_id)
+            if impact is not None and impact * factor > best:
+                best = impact * factor
+        return best
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[float, str, Dict[str, Any]]]:
+        """Rank documents matching every query token; returns (score, type, item)"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        groups = [self.expand(token, i == len(tokens) - 1) for i, token in enumerate(tokens)]
+        if any(not group for group in groups):
+            return []
+
+        if len(groups) == 1:
+            hits = []
+            for score, doc_id in self._stream(groups[0]):
+                hits.append((score, doc_id))
+                if len(hits) >= limit:
+                    break
+        else:
+            # Drive from the rarest group and probe the others
+            groups.sort(key=lambda g: sum(len(self.postings[t]) for t, _ in g))
+            driver, others = groups[0], groups[1:]
+            candidates = set()
+            for term, _ in driver:
+                candidates.update(self.postings[term])
+            scored = []
+            for doc_id in candidates:
+                total = self._group_score(driver, doc_id)
+                for group in others:
+                    part = self._group_score(group, doc_id)
+                    if part == 0.0:
+                        break
+                    total += part
+                else:
+                    scored.append((total * self.boosts[doc_id], doc_id))
+            hits = heapq.nlargest(limit, scored)
+
+        return [(score, *self.documents[doc_id]) for score, doc_id in hits]
+
+
+def build_explore_index(snapshot) -> SearchIndex:
+    """Index hotels, places and activities of a catalog snapshot"""
+    documents = []
+    for collection, item_type in (("hotels", "hotel"), ("places", "place"), ("activities", "activity")):
+        for item in snapshot.collection(collection):
+            documents.append((item_type, item))
+    return SearchIndex(documents)
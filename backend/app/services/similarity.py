@@ -0,0 +1,233 @@
+import hashlib
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.text import normalize, tokenize
+
+SIMILAR_TOP_K = 10
+MAX_FEATURES = 4096
+# Above this share of changed items a snapshot gets a fresh vocabulary and IDF
+REBUILD_FRACTION = 0.2
+
+TEXT_FIELDS = ("name", "title", "description", "summary", "location", "city", "type", "category")
+# Structured attributes become single features so a shared category or city counts as one strong signal
+TAG_FIELDS = ("category", "city", "type")
+TAG_WEIGHT = 2.0
+
+
+def item_features(item: Dict[str, Any]) -> Counter:
+    features = Counter()
+    for field in TEXT_FIELDS:
+        value = item.get(field)
+        if value:
+            features.update(tokenize(str(value)))
+    for field in ("tags", "amenities"):
+        for value in item.get(field) or []:
+            features[f"tag={normalize(str(value))}"] += TAG_WEIGHT
+    for field in TAG_FIELDS:
+        value = item.get(field)
+        if value:
+            features[f"{field}={normalize(str(value))}"] += TAG_WEIGHT
+    return features
+
+
+def item_fingerprint(item: Dict[str, Any]) -> str:
+    parts = [f"{term}:{weight}" for term, weight in sorted(item_features(item).items())]
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=12).hexdigest()
+
+
+class NeighbourIndex:
+    """Sparse TF-IDF vectors for a catalog collection with each item's top-k neighbours precomputed.
+
+    Each vector keeps only its non-zero columns, and an inverted index maps a
+    column to the items that have it, so scoring one item touches only the
+    items it shares a feature with. Memory grows with the number of
+    non-zero features, not items x vocabulary. Lookups are a dict access.
+    When the catalog changes, `updated` patches the changed vectors in place
+    and recomputes only the neighbour lists the change can affect.
+    """
+
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.fingerprints: Dict[str, str] = {}
+        # Items get integer slots so postings can be gathered into NumPy arrays
+        self.slots: Dict[str, int] = {}
+        self.slot_ids: List[Optional[str]] = []
+        self._free_slots: List[int] = []
+        self.vectors: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.postings: Dict[int, Dict[int, float]] = {}
+        self._posting_arrays: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self.neighbours: Dict[str, List[Tuple[str, float]]] = {}
+
+    @classmethod
+    def build(cls, items: List[Dict[str, Any]]) -> "NeighbourIndex":
+        features = [item_features(item) for item in items]
+        document_frequency = Counter()
+        for item_features_ in features:
+            document_frequency.update(item_features_.keys())
+
+        # Terms seen once cannot make two items similar; keep the most widespread rest
+        shared = [term for term, df in document_frequency.items() if df > 1]
+        shared.sort(key=lambda term: (-document_frequency[term], term))
+        vocabulary = {term: column for column, term in enumerate(shared[:MAX_FEATURES])}
+
+        total = len(items)
+        idf = np.array(
+            [math.log((1 + total) / (1 + document_frequency[term])) + 1.0 for term in vocabulary],
+            dtype=np.float32,
+        )
+
+        index = cls(vocabulary, idf)
+        for item, item_features_ in zip(items, features):
+            index._add(item, item_features_)
+        for item_id in index.items:
+            index.neighbours[item_id] = index._top(item_id)
+        return index
+
+    def _vector(self, features: Counter) -> Tuple[np.ndarray, np.ndarray]:
+        weights = {}
+        for term, weight in features.items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                weights[column] = (1.0 + math.log(weight)) * float(self.idf[column])
+        columns = np.fromiter(weights.keys(), dtype=np.int32, count=len(weights))
+        values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+        norm = float(np.linalg.norm(values))
+        if norm > 0:
+            values /= norm
+        return columns, values
+
+    def _add(self, item: Dict[str, Any], features: Optional[Counter] = None) -> None:
+        item_id = item.get("id")
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self.slot_ids[slot] = item_id
+        else:
+            slot = len(self.slot_ids)
+            self.slot_ids.append(item_id)
+        self.slots[item_id] = slot
+        self.items[item_id] = item
+        self.fingerprints[item_id] = item_fingerprint(item)
+        columns, values = self._vector(item_features(item) if features is None else features)
+        self.vectors[item_id] = (columns, values)
+        for column, value in zip(columns.tolist(), values.tolist()):
+            self.postings.setdefault(column, {})[slot] = value
+            self._posting_arrays.pop(column, None)
+
+    def _remove(self, item_id: str) -> None:
+        slot = self.slots.pop(item_id)
+        self.slot_ids[slot] = None
+        self._free_slots.append(slot)
+        columns, _ = self.vectors.pop(item_id)
+        for column in columns.tolist():
+            self.postings[column].pop(slot, None)
+            self._posting_arrays.pop(column, None)
+        self.items.pop(item_id, None)
+        self.fingerprints.pop(item_id, None)
+        self.neighbours.pop(item_id, None)
+
+    def _posting(self, column: int) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._posting_arrays.get(column)
+        if arrays is None:
+            posting = self.postings.get(column, {})
+            arrays = self._posting_arrays[column] = (
+                np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                np.fromiter(posting.values(), dtype=np.float32, count=len(posting)),
+            )
+        return arrays
+
+    def _scores(self, item_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Slots sharing a feature with the item and their cosine similarity to it"""
+        columns, values = self.vectors[item_id]
+        if not len(columns):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        gathered = [self._posting(column) for column in columns.tolist()]
+        slots = np.concatenate([g[0] for g in gathered])
+        weights = np.concatenate([g[1] * value for g, value in zip(gathered, values.tolist())])
+        candidates, inverse = np.unique(slots, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+        keep = (candidates != self.slots[item_id]) & (scores > 0)
+        return candidates[keep], scores[keep]
+
+    def _top(self, item_id: str) -> List[Tuple[str, float]]:
+        slots, scores = self._scores(item_id)
+        k = min(SIMILAR_TOP_K, scores.size)
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self.slot_ids[slots[b]], float(scores[b])) for b in best]
+
+    def updated(self, items: List[Dict[str, Any]]) -> "NeighbourIndex":
+        """Index for a new catalog snapshot, patched in place for small changes"""
+        fingerprints = {item.get("id"): item_fingerprint(item) for item in items}
+        removed = set(self.fingerprints) - set(fingerprints)
+        dirty = {item_id for item_id, fp in fingerprints.items() if self.fingerprints.get(item_id) != fp}
+        if not items or len(removed) + len(dirty) > REBUILD_FRACTION * len(items):
+            return NeighbourIndex.build(items)
+
+        # Old vectors that no longer exist; lists that held one must be rebuilt in full
+        stale = removed | (dirty & set(self.fingerprints))
+        for item_id in stale:
+            self._remove(item_id)
+        by_id = {item.get("id"): item for item in items}
+        for item_id in dirty:
+            self._add(by_id[item_id])
+        for item_id in set(by_id) - dirty:
+            self.items[item_id] = by_id[item_id]
+
+        recompute = set(dirty)
+        for item_id, neighbours in self.neighbours.items():
+            if any(other in stale for other, _ in neighbours):
+                recompute.add(item_id)
+
+        # Unaffected lists: merge the old top-k with similarities to the new vectors
+        merges: Dict[str, Dict[str, float]] = {}
+        for item_id in dirty:
+            slots, scores = self._scores(item_id)
+            for slot, score in zip(slots.tolist(), scores.tolist()):
+                other = self.slot_ids[slot]
+                if other not in recompute:
+                    merges.setdefault(other, {})[item_id] = score
+        for other, additions in merges.items():
+            merged = dict(self.neighbours.get(other, ()))
+            merged.update(additions)
+            self.neighbours[other] = sorted(merged.items(), key=lambda pair: -pair[1])[:SIMILAR_TOP_K]
+
+        for item_id in recompute:
+            self.neighbours[item_id] = self._top(item_id)
+        return self
+
+    def similar(self, item_id: str, limit: int = SIMILAR_TOP_K) -> Optional[List[Tuple[Dict[str, Any], float]]]:
+        """Neighbours of an item as (item, score), or None if the item is unknown"""
+        if item_id not in self.items:
+            return None
+        return [(self.items[other], score) for other, score in self.neighbours.get(item_id, [])[:limit]]
+
+
+class SimilarItems:
+    """Per-collection neighbour indexes, carried across catalog snapshots for incremental updates"""
+
+    def __init__(self):
+        self._latest: Dict[str, NeighbourIndex] = {}
+
+    def _refresh(self, collection: str, items: List[Dict[str, Any]]) -> NeighbourIndex:
+        previous = self._latest.get(collection)
+        index = previous.updated(items) if previous else NeighbourIndex.build(items)
+        self._latest[collection] = index
+        return index
+
+    def for_snapshot(self, snapshot, collection: str) -> NeighbourIndex:
+        return snapshot.derived(
+            f"similar:{collection}",
+            lambda snap: self._refresh(collection, snap.collection(collection))
+        )
+
+
+# Global instance
+similar_items = SimilarItems()
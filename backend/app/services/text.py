@@ -0,0 +1,38 @@
+import re
+import unicodedata
+from typing import List
+
+# Letters folded after diacritics are stripped. NFD already reduces hamza and
+# madda forms of alef (أ إ آ) to bare alef; these cover what it leaves behind.
+_FOLD = str.maketrans({
+    "ٱ": "ا",  # alef wasla
+    "ى": "ي",  # alef maksura -> ya
+    "ی": "ي",  # farsi ya
+    "ة": "ه",  # ta marbuta -> ha
+    "ک": "ك",  # keheh -> kaf
+    "ـ": None,  # tatweel (kashida)
+    "ı": "i",  # Turkish dotless i
+    **{chr(0x0660 + d): str(d) for d in range(10)},  # Arabic-Indic digits
+    **{chr(0x06F0 + d): str(d) for d in range(10)},  # Extended Arabic-Indic digits
+})
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Fold text for matching: NFKC, case, diacritics and Arabic/Turkish letter variants.
+
+    "İstanbul", "ISTANBUL" and "istanbul" all become "istanbul"; "Café" becomes
+    "cafe"; "أبوظبي" and "ابوظبى" both become "ابوظبي".
+    """
+    text = unicodedata.normalize("NFKC", text)
+    # Turkish capital dotted I would otherwise lower to "i" + combining dot
+    text = text.replace("İ", "i").casefold()
+    decomposed = unicodedata.normalize("NFD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return stripped.translate(_FOLD)
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized word tokens; run once per field at index time and once per query"""
+    return _TOKEN_RE.findall(normalize(text))
@@ -0,0 +1,236 @@
+import asyncio
+import bisect
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.json_store import StoreObserver, json_store
+
+# (created_at, id) ordering key, compared newest first
+TimelineKey = Tuple[str, str]
+# (key, kind, author_id, item)
+TimelineEntry = Tuple[TimelineKey, str, str, Dict[str, Any]]
+
+TIMELINE_KINDS = {"checkins": "checkin", "posts": "post"}
+
+
+def follow_id(follower_id: str, followee_id: str) -> str:
+    """Deterministic store id, so a follow edge exists at most once"""
+    return f"{follower_id}->{followee_id}"
+
+
+class FollowGraph(StoreObserver):
+    """Follower and following sets per user, mirrored from the `follows` collection"""
+    collections = ("follows",)
+
+    def __init__(self):
+        self.followers: Dict[str, Set[str]] = {}
+        self.following: Dict[str, Set[str]] = {}
+
+    def _apply(self, edge: Optional[Dict[str, Any]], sign: int) -> None:
+        if not edge:
+            return
+        follower, followee = edge.get("follower_id"), edge.get("followee_id")
+        if sign > 0:
+            self.followers.setdefault(followee, set()).add(follower)
+            self.following.setdefault(follower, set()).add(followee)
+        else:
+            self.followers.get(followee, set()).discard(follower)
+            self.following.get(follower, set()).discard(followee)
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.followers = {}
+        self.following = {}
+        for edge in data.get("follows", []):
+            self._apply(edge, 1)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        self._apply(before, -1)
+        self._apply(after, 1)
+
+    def is_following(self, follower_id: str, followee_id: str) -> bool:
+        return followee_id in self.following.get(follower_id, ())
+
+    def is_celebrity(self, user_id: str) -> bool:
+        return len(self.followers.get(user_id, ())) > settings.TIMELINE_CELEBRITY_FOLLOWERS
+
+
+def entry_order(entry: TimelineEntry) -> Tuple[TimelineKey, str]:
+    return entry[0], entry[1]
+
+
+class Timelines(StoreObserver):
+    """Bounded per-user home timeline inboxes, filled by fan-out on write.
+
+    Every author has an outbox of their newest check-ins and posts, kept in
+    sync with the store. New items are copied into each follower's inbox by
+    a background fan-out; authors with more than
+    TIMELINE_CELEBRITY_FOLLOWERS followers are skipped and their outbox is
+    merged in at read time instead. Reads merge the inbox, the followed
+    celebrities' outboxes and the reader's own outbox, newest first.
+
+    Boxes are lists kept oldest first by (created_at, id), so an item
+    written out of order (an import, a re-dated check-in) lands in place,
+    the oldest entry is the one dropped when a box is full, and a page
+    starts with a bisect. Deletes and unfollows take entries out of the
+    inboxes they were copied to, and an author who drops back under the
+    celebrity threshold has their outbox merged into their followers'
+    inboxes, so nothing they posted as a celebrity goes missing.
+    """
+    collections = tuple(TIMELINE_KINDS) + ("follows",)
+
+    def __init__(self, graph: FollowGraph, inbox_size: int):
+        self.graph = graph
+        self.inbox_size = inbox_size
+        self.inboxes: Dict[str, List[TimelineEntry]] = {}
+        self.outboxes: Dict[str, List[TimelineEntry]] = {}
+
+    @staticmethod
+    def _entry(collection_name: str, item: Dict[str, Any]) -> TimelineEntry:
+        key = (item.get("created_at") or "", item.get("id") or "")
+        return (key, TIMELINE_KINDS[collection_name], item.get("user_id"), item)
+
+    def _insert(self, box: List[TimelineEntry], entry: TimelineEntry) -> None:
+        order = entry_order(entry)
+        if len(box) >= self.inbox_size and order < entry_order(box[0]):
+            return
+        position = bisect.bisect_left(box, order, key=entry_order)
+        if position < len(box) and entry_order(box[position]) == order:
+            return
+        box.insert(position, entry)
+        if len(box) > self.inbox_size:
+            del box[0]
+
+    @staticmethod
+    def _discard(box: Optional[List[TimelineEntry]], entry: TimelineEntry) -> None:
+        if not box:
+            return
+        order = entry_order(entry)
+        position = bisect.bisect_left(box, order, key=entry_order)
+        if position < len(box) and entry_order(box[position]) == order:
+            del box[position]
+
+    @staticmethod
+    def _contains(box: Optional[List[TimelineEntry]], entry: TimelineEntry) -> bool:
+        if not box:
+            return False
+        order = entry_order(entry)
+        position = bisect.bisect_left(box, order, key=entry_order)
+        return position < len(box) and entry_order(box[position]) == order
+
+    def _newest(self, sources: Iterable[List[TimelineEntry]], before: Optional[TimelineKey] = None) -> Iterator[TimelineEntry]:
+        """Entries of sorted boxes strictly older than `before`, merged newest first"""
+        def older(box: List[TimelineEntry]) -> Iterator[TimelineEntry]:
+            end = len(box) if before is None else bisect.bisect_left(box, before, key=lambda entry: entry[0])
+            return (box[i] for i in range(end - 1, -1, -1))
+        return heapq.merge(*(older(box) for box in sources), key=entry_order, reverse=True)
+
+    def _merge_into(self, follower_id: str, authors: Iterable[str]) -> None:
+        """Rebuild a follower's inbox as the newest entries of it and the authors' outboxes"""
+        sources = [self.inboxes.get(follower_id, [])] + [self.outboxes[a] for a in authors if a in self.outboxes]
+        newest = []
+        for entry in self._newest(sources):
+            if newest and entry_order(newest[-1]) == entry_order(entry):
+                continue
+            newest.append(entry)
+            if len(newest) == self.inbox_size:
+                break
+        newest.reverse()
+        self.inboxes[follower_id] = newest
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.inboxes = {}
+        self.outboxes = {}
+        entries = [self._entry(name, item) for name in TIMELINE_KINDS for item in data.get(name, [])]
+        entries.sort(key=entry_order)
+        for entry in entries:
+            self.outboxes.setdefault(entry[2], []).append(entry)
+        for author_id, outbox in self.outboxes.items():
+            self.outboxes[author_id] = outbox[-self.inbox_size:]
+
+        # Seed inboxes from the outboxes of followed, non-celebrity authors
+        for follower, followees in self.graph.following.items():
+            authors = [a for a in followees if not self.graph.is_celebrity(a)]
+            if authors:
+                self._merge_into(follower, authors)
+
+    def _follows_changed(self, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if before is None or after is not None:
+            # New follows are backfilled by the router's background task
+            return
+        follower_id, followee_id = before.get("follower_id"), before.get("followee_id")
+        inbox = self.inboxes.get(follower_id)
+        if inbox:
+            self.inboxes[follower_id] = [entry for entry in inbox if entry[2] != followee_id]
+        # Just dropped under the threshold: reads stop merging the outbox, so the inboxes need it
+        if len(self.graph.followers.get(followee_id, ())) == settings.TIMELINE_CELEBRITY_FOLLOWERS:
+            for follower in self.graph.followers[followee_id]:
+                self._merge_into(follower, [followee_id])
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if collection_name == "follows":
+            self._follows_changed(before, after)
+            return
+        old = self._entry(collection_name, before) if before is not None else None
+        new = self._entry(collection_name, after) if after is not None else None
+        if old is not None and new is not None and old[0] == new[0]:
+            return
+        if old is not None:
+            self._discard(self.outboxes.get(old[2]), old)
+            for follower in self.graph.followers.get(old[2], ()):
+                self._discard(self.inboxes.get(follower), old)
+        if new is not None:
+            self._insert(self.outboxes.setdefault(new[2], []), new)
+            if old is not None and not self.graph.is_celebrity(new[2]):
+                # Re-dated in place; new items reach the inboxes through fan_out
+                for follower in self.graph.followers.get(new[2], ()):
+                    self._insert(self.inboxes.setdefault(follower, []), new)
+
+    async def fan_out(self, collection_name: str, item: Dict[str, Any]) -> None:
+        """Copy a new item into its author's followers' inboxes, yielding between chunks"""
+        author_id = item.get("user_id")
+        if self.graph.is_celebrity(author_id):
+            return
+        entry = self._entry(collection_name, item)
+        followers = list(self.graph.followers.get(author_id, ()))
+        chunk = settings.TIMELINE_FANOUT_CHUNK
+        for start in range(0, len(followers), chunk):
+            # Deleted while the fan-out was pending or paused
+            if not self._contains(self.outboxes.get(author_id), entry):
+                return
+            for follower in followers[start:start + chunk]:
+                self._insert(self.inboxes.setdefault(follower, []), entry)
+            await asyncio.sleep(0)
+
+    async def backfill(self, follower_id: str, followee_id: str) -> None:
+        """Merge a newly followed author's recent items into the follower's inbox"""
+        if self.graph.is_celebrity(followee_id):
+            return
+        self._merge_into(follower_id, [followee_id])
+
+    def page(self, user_id: str, before: Optional[TimelineKey], limit: int) -> Tuple[List[TimelineEntry], bool]:
+        """Up to `limit` timeline entries strictly older than `before`, newest first"""
+        following = self.graph.following.get(user_id, set())
+        sources = [self.inboxes.get(user_id, []), self.outboxes.get(user_id, [])]
+        sources += [self.outboxes[a] for a in following if a in self.outboxes and self.graph.is_celebrity(a)]
+
+        page: List[TimelineEntry] = []
+        seen: Set[Tuple[str, str]] = set()
+        for entry in self._newest(sources, before):
+            key, kind, author_id, item = entry
+            identity = (kind, item.get("id"))
+            # A celebrity's outbox can repeat entries fanned out before they crossed the threshold
+            if identity in seen or (author_id != user_id and author_id not in following):
+                continue
+            seen.add(identity)
+            page.append(entry)
+            if len(page) > limit:
+                break
+        return page[:limit], len(page) > limit
+
+
+# Global instances
+follow_graph = FollowGraph()
+timelines = Timelines(follow_graph, settings.TIMELINE_INBOX_SIZE)
+json_store.add_observer(follow_graph)
+json_store.add_observer(timelines)
@@ -0,0 +1,148 @@
+import heapq
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.json_store import StoreObserver, json_store
+
+SIGNAL_WEIGHTS = {"checkin": 3.0, "save": 2.0, "view": 1.0}
+# Shift the decay epoch forward once boosts grow past 2**64 so scores stay in float range
+RENORMALIZE_HALF_LIVES = 64.0
+
+
+def event_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from an ISO timestamp (naive values are UTC), or None"""
+    if not value:
+        return None
+    try:
+        text = str(value)
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class TrendingPlaces(StoreObserver):
+    """Exponentially time-decayed engagement scores with a bounded top-k.
+
+    Scores use forward decay: an event at time t adds
+    weight * 2 ** ((t - epoch) / half_life), so every score decays at the same
+    rate and the ranking only changes when an event arrives. The top-k set is
+    therefore maintained exactly on each event, and reading it costs O(k)
+    however many places have been seen. Check-ins are replayed from the store
+    on load; saves and views are kept in memory only, and survive a rebuild.
+
+    The curated `trending_places` list is mirrored in order as the
+    cold-start ranking, so `leaders` merges it with the live top-k without
+    reading the store.
+    """
+    collections = ("checkins", "trending_places")
+
+    def __init__(self, half_life_hours: float, top_k: int):
+        self.half_life = half_life_hours * 3600.0
+        self.top_k = top_k
+        self.curated: Dict[str, Dict[str, Any]] = {}
+        self.epoch = time.time()
+        self.scores: Dict[str, float] = {}
+        # The save and view share of each score, which the store cannot replay
+        self.unstored: Dict[str, float] = {}
+        self.top: Dict[str, float] = {}
+
+    def _boost(self, at: float) -> float:
+        exponent = (at - self.epoch) / self.half_life
+        if exponent > RENORMALIZE_HALF_LIVES:
+            self._renormalize(at)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _renormalize(self, at: float) -> None:
+        factor = 2.0 ** (-(at - self.epoch) / self.half_life)
+        self.epoch = at
+        self.scores = {place_id: score * factor for place_id, score in self.scores.items() if score * factor > 0}
+        self.unstored = {place_id: score * factor for place_id, score in self.unstored.items() if score * factor > 0}
+        self._rebuild_top()
+
+    def _rebuild_top(self) -> None:
+        self.top = dict(heapq.nlargest(self.top_k, self.scores.items(), key=lambda pair: pair[1]))
+
+    def _offer(self, place_id: str, score: float) -> None:
+        if place_id in self.top or len(self.top) < self.top_k:
+            self.top[place_id] = score
+            return
+        floor_id = min(self.top, key=self.top.__getitem__)
+        if score > self.top[floor_id]:
+            del self.top[floor_id]
+            self.top[place_id] = score
+
+    def record(self, place_id: Optional[str], signal: str, at: Optional[float] = None, sign: int = 1) -> None:
+        """Count one check-in, save or view of a place (sign=-1 retracts it)"""
+        if not place_id or signal not in SIGNAL_WEIGHTS:
+            return
+        delta = sign * SIGNAL_WEIGHTS[signal] * self._boost(time.time() if at is None else at)
+        score = self._add(self.scores, place_id, delta)
+        if signal != "checkin":
+            self._add(self.unstored, place_id, delta)
+
+        if sign > 0:
+            self._offer(place_id, score)
+        elif place_id in self.top:
+            # A top entry went down; something outside the set may now outrank it
+            self._rebuild_top()
+
+    @staticmethod
+    def _add(scores: Dict[str, float], place_id: str, delta: float) -> float:
+        score = scores.get(place_id, 0.0) + delta
+        if score <= 0:
+            scores.pop(place_id, None)
+        else:
+            scores[place_id] = score
+        return score
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.curated = {place.get("id"): place for place in data.get("trending_places", [])}
+        self.scores = dict(self.unstored)
+        self._rebuild_top()
+        for checkin in data.get("checkins", []):
+            self.record(checkin.get("place_id"), "checkin", event_timestamp(checkin.get("created_at")))
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if collection_name == "trending_places":
+            if after is not None:
+                self.curated[after.get("id")] = after
+            elif before is not None:
+                self.curated.pop(before.get("id"), None)
+            return
+        if before is not None and after is not None and before.get("place_id") == after.get("place_id"):
+            return
+        if before is not None:
+            self.record(before.get("place_id"), "checkin", event_timestamp(before.get("created_at")), sign=-1)
+        if after is not None:
+            self.record(after.get("place_id"), "checkin", event_timestamp(after.get("created_at")))
+
+    def ranked(self, limit: int) -> List[Tuple[str, float]]:
+        """Top places with their current decayed score, highest first"""
+        now_factor = 2.0 ** ((self.epoch - time.time()) / self.half_life)
+        ranked = heapq.nlargest(limit, self.top.items(), key=lambda pair: pair[1])
+        return [(place_id, score * now_factor) for place_id, score in ranked]
+
+    def leaders(self, limit: int) -> List[Tuple[str, float, Optional[Dict[str, Any]]]]:
+        """Live top places then the rest of the curated list, as (place_id, score, curated place or None)"""
+        leaders = [(place_id, score, self.curated.get(place_id)) for place_id, score in self.ranked(limit)]
+        if len(leaders) < limit:
+            # Curated places beyond the live top-k have no live score; they follow in curated order
+            for place_id, place in self.curated.items():
+                if place_id not in self.top:
+                    leaders.append((place_id, 0.0, place))
+                    if len(leaders) == limit:
+                        break
+        return leaders
+
+
+# Global instance
+trending_places = TrendingPlaces(settings.TRENDING_HALF_LIFE_HOURS, settings.TRENDING_TOP_K)
+json_store.add_observer(trending_places)
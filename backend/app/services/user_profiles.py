@@ -0,0 +1,101 @@
+import bisect
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.json_store import StoreObserver, json_store
+
+PROFILE_RECENT_ITEMS = 5
+
+# collection -> (profile list key, profile count key); items are owned by `user_id`, ordered by `created_at`
+PROFILE_SECTIONS: Dict[str, Tuple[str, str]] = {
+    "checkins": ("recent_checkins", "total_checkins"),
+    "posts": ("wall_posts", "posts_count"),
+    "bookings": ("bookings", "bookings_count"),
+}
+
+ActivityKey = Tuple[str, str]
+
+
+def activity_key(item: Dict[str, Any]) -> ActivityKey:
+    return (str(item.get("created_at") or ""), str(item.get("id") or ""))
+
+
+class OrderedItems:
+    """One owner's items of one kind, ordered by (created_at, id)"""
+    __slots__ = ("keys", "items")
+
+    def __init__(self):
+        self.keys: List[ActivityKey] = []
+        self.items: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, item: Dict[str, Any]) -> None:
+        bisect.insort(self.keys, activity_key(item))
+        self.items[item.get("id")] = item
+
+    def remove(self, item: Dict[str, Any]) -> None:
+        key = activity_key(item)
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+            self.items.pop(item.get("id"), None)
+
+    def page(self, before: Optional[ActivityKey], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Up to `limit` items strictly older than `before`, newest first"""
+        end = len(self.keys) if before is None else bisect.bisect_left(self.keys, before)
+        start = max(end - limit, 0)
+        return [self.items[key[1]] for key in reversed(self.keys[start:end])], start > 0
+
+
+class UserProfiles(StoreObserver):
+    """Per-user, time-ordered indexes of check-ins, wall posts and bookings.
+
+    Each (user, kind) keeps its sorted (created_at, id) keys, so a keyset
+    page of a user sub-resource is a bisect plus a slice, and the profile's
+    counts and newest items are lookups on the same index. Items are
+    references to the stored dicts, so counters such as likes stay current.
+    """
+    collections = tuple(PROFILE_SECTIONS)
+
+    def __init__(self):
+        self.indexes: Dict[Tuple[str, str], OrderedItems] = {}
+
+    def _index(self, user_id: str, collection_name: str) -> OrderedItems:
+        index = self.indexes.get((user_id, collection_name))
+        if index is None:
+            index = self.indexes[(user_id, collection_name)] = OrderedItems()
+        return index
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.indexes = {}
+        for collection_name in PROFILE_SECTIONS:
+            for item in data.get(collection_name, []):
+                self._index(item.get("user_id"), collection_name).add(item)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if before is not None and after is not None:
+            if before.get("user_id") == after.get("user_id") and activity_key(before) == activity_key(after):
+                return
+        if before is not None:
+            self._index(before.get("user_id"), collection_name).remove(before)
+        if after is not None:
+            self._index(after.get("user_id"), collection_name).add(after)
+
+    def page(self, user_id: str, collection_name: str, before: Optional[ActivityKey], limit: int) -> Tuple[List[Dict[str, Any]], bool]:
+        index = self.indexes.get((user_id, collection_name))
+        return index.page(before, limit) if index else ([], False)
+
+    def count(self, user_id: str, collection_name: str) -> int:
+        index = self.indexes.get((user_id, collection_name))
+        return len(index.keys) if index else 0
+
+    def profile(self, user_id: str) -> Dict[str, Any]:
+        """Counts and newest items of every section, keyed as in the profile response"""
+        profile: Dict[str, Any] = {}
+        for collection_name, (list_key, count_key) in PROFILE_SECTIONS.items():
+            profile[list_key], _ = self.page(user_id, collection_name, None, PROFILE_RECENT_ITEMS)
+            profile[count_key] = self.count(user_id, collection_name)
+        return profile
+
+
+# Global instance
+user_profiles = UserProfiles()
+json_store.add_observer(user_profiles)
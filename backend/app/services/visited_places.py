@@ -0,0 +1,159 @@
+import heapq
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.services.autocomplete import item_city
+from app.services.catalog import catalog_store
+from app.services.json_store import StoreObserver, json_store
+from app.services.text import normalize
+from app.services.user_profiles import OrderedItems
+
+# Check-in fields the index reads
+CHECKIN_FIELDS = ("id", "user_id", "place_id", "created_at", "rating")
+
+
+class PlaceVisit:
+    """One user's history with one place: their check-ins there, ordered by (created_at, id)"""
+    __slots__ = ("checkins", "city")
+
+    def __init__(self, city: Optional[str]):
+        self.checkins = OrderedItems()
+        self.city = city
+
+    @property
+    def visit_count(self) -> int:
+        return len(self.checkins.keys)
+
+    @property
+    def latest(self) -> Dict[str, Any]:
+        return self.checkins.items[self.checkins.keys[-1][1]]
+
+    @property
+    def last_visit(self) -> str:
+        return self.checkins.keys[-1][0]
+
+    @property
+    def last_checkin_id(self) -> str:
+        return self.checkins.keys[-1][1]
+
+    @property
+    def last_rating(self) -> Optional[int]:
+        return self.latest.get("rating")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"user_rating": self.last_rating, "last_visit": self.last_visit, "visit_count": self.visit_count}
+
+
+class VisitedPlaces(StoreObserver):
+    """Per-user `place_id -> PlaceVisit` maps and distinct-city counts, kept in sync with check-ins.
+
+    Each visit keeps its own check-ins in order, so deleting one is a
+    bisect and the latest visit is the last key. Store places are
+    mirrored by id, with the users who visited each, so listing a user's
+    places is a dict lookup per place and a place moving city updates
+    only its visitors' counts. The catalog is read once per rebuild.
+    """
+    collections = ("checkins", "places")
+
+    def __init__(self):
+        self.users: Dict[str, Dict[str, PlaceVisit]] = {}
+        self.cities: Dict[str, Dict[str, int]] = {}
+        self.places: Dict[str, Dict[str, Any]] = {}
+        self.visitors: Dict[str, Set[str]] = {}
+        self._catalog: Dict[str, Dict[str, Any]] = {}
+
+    def _catalog_places(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return catalog_store.snapshot().by_id("places")
+        except (OSError, ValueError):
+            return {}
+
+    def place(self, place_id: str) -> Optional[Dict[str, Any]]:
+        """Store place, or the catalog place with that id"""
+        place = self.places.get(place_id)
+        if place is None:
+            place = catalog_store.snapshot().by_id("places").get(place_id)
+        return place
+
+    def _city(self, place_id: str) -> Optional[str]:
+        place = self.places.get(place_id) or self._catalog.get(place_id)
+        city = item_city(place) if place else None
+        return normalize(city) if city else None
+
+    def _count_city(self, user_id: str, city: Optional[str], delta: int) -> None:
+        if not city:
+            return
+        cities = self.cities.setdefault(user_id, {})
+        cities[city] = cities.get(city, 0) + delta
+        if not cities[city]:
+            del cities[city]
+
+    def _add(self, checkin: Dict[str, Any]) -> None:
+        user_id, place_id = checkin.get("user_id"), checkin.get("place_id")
+        visits = self.users.setdefault(user_id, {})
+        visit = visits.get(place_id)
+        if visit is None:
+            visit = visits[place_id] = PlaceVisit(self._city(place_id))
+            self.visitors.setdefault(place_id, set()).add(user_id)
+            self._count_city(user_id, visit.city, 1)
+        visit.checkins.add(checkin)
+
+    def _remove(self, checkin: Dict[str, Any]) -> None:
+        user_id, place_id = checkin.get("user_id"), checkin.get("place_id")
+        visit = self.users.get(user_id, {}).get(place_id)
+        if visit is None:
+            return
+        visit.checkins.remove(checkin)
+        if not visit.visit_count:
+            del self.users[user_id][place_id]
+            self.visitors.get(place_id, set()).discard(user_id)
+            self._count_city(user_id, visit.city, -1)
+
+    def _place_changed(self, place_id: str) -> None:
+        city = self._city(place_id)
+        for user_id in self.visitors.get(place_id, ()):
+            visit = self.users[user_id][place_id]
+            if visit.city != city:
+                self._count_city(user_id, visit.city, -1)
+                self._count_city(user_id, city, 1)
+                visit.city = city
+
+    def rebuild(self, data: Dict[str, Any]) -> None:
+        self.users = {}
+        self.cities = {}
+        self.visitors = {}
+        self.places = {place.get("id"): place for place in data.get("places", [])}
+        self._catalog = self._catalog_places()
+        for checkin in data.get("checkins", []):
+            self._add(checkin)
+
+    def on_change(self, collection_name: str, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+        if collection_name == "places":
+            if before is not None:
+                self.places.pop(before.get("id"), None)
+            if after is not None:
+                self.places[after.get("id")] = after
+            self._place_changed((after or before).get("id"))
+            return
+        # Likes and comments don't change anything indexed; skip the remove/add
+        if before is not None and after is not None and all(before.get(f) == after.get(f) for f in CHECKIN_FIELDS):
+            return
+        if before is not None:
+            self._remove(before)
+        if after is not None:
+            self._add(after)
+
+    def visits(self, user_id: str) -> Dict[str, PlaceVisit]:
+        return self.users.get(user_id, {})
+
+    def counts(self, user_id: str) -> Dict[str, int]:
+        """The profile's visited_places and cities counters"""
+        return {"visited_places": len(self.visits(user_id)), "cities": len(self.cities.get(user_id, {}))}
+
+    def recent(self, user_id: str, limit: int) -> List[Tuple[str, PlaceVisit]]:
+        """The user's most recently visited places, newest first"""
+        return heapq.nlargest(limit, self.visits(user_id).items(), key=lambda pair: (pair[1].last_visit, pair[1].last_checkin_id))
+
+
+# Global instance
+visited_places = VisitedPlaces()
+json_store.add_observer(visited_places)
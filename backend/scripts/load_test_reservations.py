@@ -0,0 +1,116 @@
+"""Thundering-herd load test for event seat reservations.
+
+Seeds a throwaway copy of the mock store with many users and one event of
+limited capacity, fires concurrent join requests through the ASGI app
+(every user joins more than once), then checks both the responses and the
+saved store for overbooking. Exits non-zero if any check fails.
+
+    python -m scripts.load_test_reservations --users 3000 --capacity 500 --repeat 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MOCK_DB = Path(__file__).resolve().parent.parent / "mock_data" / "db.json"
+EVENT_ID = "load-test-event"
+
+
+def seed_store(path: Path, users: int, capacity: int) -> None:
+    with open(MOCK_DB, "r", encoding="utf-8") as source:
+        data = json.load(source)
+    template = data["users"][0]
+    data["users"] = [dict(template, id=f"load{i}", username=f"load{i}") for i in range(users)]
+    template = data["events"][0]
+    data["events"] = [dict(template, id=EVENT_ID, attendees=0, max_attendees=capacity)]
+    data["event_attendees"] = []
+    with open(path, "w", encoding="utf-8") as target:
+        json.dump(data, target)
+
+
+async def run(args: argparse.Namespace, path: Path) -> int:
+    # Imported late: the store reads MOCK_DATA_PATH when the app is imported
+    import httpx
+    from app.main import app
+    from app.routers.auth import create_access_token
+    from app.services.json_store import json_store
+    from app.services.reservations import event_reservations
+
+    saves = 0
+    save_data = json_store.save_data
+
+    async def counting_save() -> None:
+        nonlocal saves
+        saves += 1
+        await save_data()
+
+    json_store.save_data = counting_save
+    await json_store.load_data()
+
+    headers = [{"Authorization": f"Bearer {create_access_token({'sub': f'load{i}'})}"} for i in range(args.users)]
+    requests = [headers[i % args.users] for i in range(args.users * args.repeat)]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[client.post(f"/api/v1/events/{EVENT_ID}/join", headers=h) for h in requests])
+        seconds = time.perf_counter() - started
+    await event_reservations.flush()
+
+    outcomes = {"joined": 0, "already_joined": 0, "full": 0, "other": 0}
+    for response in responses:
+        body = response.json()
+        if response.status_code == 200:
+            outcomes["already_joined" if body["data"]["already_joined"] else "joined"] += 1
+        elif response.status_code == 400 and body.get("detail") == "Event is full":
+            outcomes["full"] += 1
+        else:
+            outcomes["other"] += 1
+
+    with open(path, "r", encoding="utf-8") as source:
+        saved = json.load(source)
+    event = next(e for e in saved["events"] if e["id"] == EVENT_ID)
+    records = [r for r in saved.get("event_attendees", []) if r["event_id"] == EVENT_ID]
+    seated = min(args.users, args.capacity)
+
+    print(json.dumps({
+        "requests": len(requests),
+        "seconds": round(seconds, 3),
+        "joins_per_second": round(len(requests) / seconds, 1),
+        "saves": saves,
+        "outcomes": outcomes,
+        "saved_attendees": event["attendees"],
+        "saved_records": len(records),
+    }, indent=2))
+
+    checks = {
+        "no seat beyond capacity": outcomes["joined"] <= args.capacity and event["attendees"] <= args.capacity,
+        "every seat taken": outcomes["joined"] == seated,
+        "one seat per user": len({r["user_id"] for r in records}) == len(records),
+        "saved count matches records": event["attendees"] == len(records) == outcomes["joined"],
+        "no unexpected responses": outcomes["other"] == 0,
+    }
+    for name, passed in checks.items():
+        print(f"{'PASS' if passed else 'FAIL'}: {name}", file=sys.stderr)
+    return 0 if all(checks.values()) else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent event joins must never overbook")
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--capacity", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=2, help="Join requests per user")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "db.json"
+        seed_store(path, args.users, args.capacity)
+        os.environ["MOCK_DATA_PATH"] = str(path)
+        return asyncio.run(run(args, path))
+
+
+if __name__ == "__main__":
+    sys.exit(main())